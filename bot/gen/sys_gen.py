@@ -33,7 +33,7 @@ def generate_cluster(num_hosts, host_speed, host_bandwidth, host_latency, master
     host_speeds = generate_values(host_speed, num_hosts)
     link_bandwidths = generate_values(host_bandwidth, num_hosts)
     link_latencies = generate_values(host_latency, num_hosts)
-    for i in xrange(0, num_hosts):
+    for i in range(0, num_hosts):
         host = {
             'id': "host%d" % i,
             'speed': host_speeds[i]
@@ -71,38 +71,42 @@ def generate_values(spec, num):
     except ValueError:
         # uniform distribution: min-max
         parts = spec.split('-')
-        min = float(parts[0])
-        max = float(parts[1])
-        values = [random.uniform(min, max) for _ in xrange(0, num)]
+        low = float(parts[0])
+        high = float(parts[1])
+        values = [random.uniform(low, high) for _ in range(0, num)]
 
     return values
 
 
 def save_as_xml_file(system, output_path):
-    with open(output_path, "w") as f:
-        f.write("<?xml version='1.0'?>\n")
-        f.write('<!DOCTYPE platform SYSTEM "http://simgrid.gforge.inria.fr/simgrid/simgrid.dtd">\n')
-        f.write('<platform version="4">\n')
-        f.write('  <AS id="AS0" routing="Floyd">\n')
-
-        for host in system['hosts']:
-            f.write('    <host id="%s" core="1" speed="%fGf"/>\n' % (host['id'], host['speed']))
-        f.write("\n")
-
-        for link in system['links']:
-            f.write('    <link id="%s" bandwidth="%fMBps" latency="%fus"/>\n' % (
+    parts = [
+        "<?xml version='1.0'?>\n",
+        '<!DOCTYPE platform SYSTEM "http://simgrid.gforge.inria.fr/simgrid/simgrid.dtd">\n',
+        '<platform version="4">\n',
+        '  <AS id="AS0" routing="Floyd">\n'
+    ]
+
+    for host in system['hosts']:
+        parts.append('    <host id="%s" core="1" speed="%fGf"/>\n' % (host['id'], host['speed']))
+    parts.append("\n")
+
+    for link in system['links']:
+        parts.append('    <link id="%s" bandwidth="%fMBps" latency="%fus"/>\n' % (
             link['id'], link['bandwidth'], link['latency']))
-        f.write("\n")
+    parts.append("\n")
 
-        f.write('    <router id="router"/>\n')
-        for route in system['routes']:
-            f.write('    <route src="%s" dst="%s">\n' % (route['src'], route['dst']))
-            for link in route['links']:
-                f.write('      <link_ctn id="%s"/>\n' % link)
-            f.write('    </route>\n')
+    parts.append('    <router id="router"/>\n')
+    for route in system['routes']:
+        parts.append('    <route src="%s" dst="%s">\n' % (route['src'], route['dst']))
+        for link in route['links']:
+            parts.append('      <link_ctn id="%s"/>\n' % link)
+        parts.append('    </route>\n')
 
-        f.write("  </AS>\n")
-        f.write("</platform>\n")
+    parts.append("  </AS>\n")
+    parts.append("</platform>\n")
+
+    with open(output_path, "w") as f:
+        f.write("".join(parts))
 
 
 def main():
@@ -125,7 +129,7 @@ def main():
     if not os.path.exists(args.output_dir):
         os.makedirs(args.output_dir)
 
-    for i in xrange(0, args.num_systems):
+    for i in range(0, args.num_systems):
         # cluster
         if args.system_type == 'cluster':
             # parse host/master bandwidth and latency
@@ -150,7 +154,7 @@ def main():
             file_name = 'cluster_%d_%s_%s_%s_%d.xml' % (
             args.num_hosts, args.host_speed, args.link_bandwidth, args.link_latency, i)
 
-        file_path = args.output_dir + '/' + file_name
+        file_path = os.path.join(args.output_dir, file_name)
         save_as_xml_file(system, file_path)
         print('Generated file: %s' % file_path)
 
@@ -16,6 +16,8 @@
 # along with this library.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import numpy
+
 cimport cplatform
 cimport common
 
@@ -75,6 +77,36 @@ def route_bandwidth(Host src not None, Host dst not None):
   return cplatform.SD_route_get_bandwidth(src.impl, dst.impl)
 
 
+def route_matrices(list hosts not None):
+  """
+  Get route bandwidth and latency between every pair of hosts.
+
+  Same values as route_bandwidth/route_latency, but the whole host list is processed
+  in a single C loop. Routes are assumed to be symmetric, diagonal is left 0.
+
+  Returns:
+    (bandwidth, latency) tuple of len(hosts) x len(hosts) matrices.
+  """
+  cdef int count = len(hosts)
+  bandwidth = numpy.zeros((count, count))
+  latency = numpy.zeros((count, count))
+  cdef double[:, :] bandwidth_view = bandwidth
+  cdef double[:, :] latency_view = latency
+  cdef Host src, dst
+  cdef int i, j
+  for i in range(count):
+    src = hosts[i]
+    if src is None or not src.impl:
+      raise Exception("Cannot build route, one of hosts is invalid")
+    for j in range(i + 1, count):
+      dst = hosts[j]
+      if dst is None or not dst.impl:
+        raise Exception("Cannot build route, one of hosts is invalid")
+      bandwidth_view[i, j] = bandwidth_view[j, i] = cplatform.SD_route_get_bandwidth(src.impl, dst.impl)
+      latency_view[i, j] = latency_view[j, i] = cplatform.SD_route_get_latency(src.impl, dst.impl)
+  return bandwidth, latency
+
+
 cdef class Host:
   """
   Representation of a platform's host.
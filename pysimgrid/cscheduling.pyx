@@ -41,6 +41,7 @@ import numpy
 
 import cplatform
 
+cimport cython
 cimport numpy as cnumpy
 cimport common
 cimport cplatform
@@ -63,15 +64,8 @@ cdef class PlatformModel(object):
 
   def __init__(self, simulation):
     hosts = simulation.hosts
-    speed = numpy.zeros(len(hosts))
-    bandwidth = numpy.zeros((len(hosts), len(hosts)))
-    latency = numpy.zeros((len(hosts), len(hosts)))
-    for i, src in enumerate(hosts):
-      speed[i] = src.speed
-      for j in range(i+1, len(hosts)):
-        dst = simulation.hosts[j]
-        bandwidth[i,j] = bandwidth[j,i] = cplatform.route_bandwidth(src, dst)
-        latency[i,j] = latency[j,i] = cplatform.route_latency(src, dst)
+    speed = numpy.array([host.speed for host in hosts], dtype=float)
+    bandwidth, latency = cplatform.route_matrices(list(hosts))
 
     self._speed = speed
     self._bandwidth = bandwidth
@@ -171,6 +165,8 @@ cdef class PlatformModel(object):
       return state.task_states[parent]["ect"]
     return task_states[parent]["ect"] + edge_dict["weight"] / self._bandwidth[src_idx, dst_idx] + self._latency[src_idx, dst_idx]
 
+  @cython.boundscheck(False)
+  @cython.wraparound(False)
   cpdef est(self, cplatform.Host host, dict parents, SchedulerState state):
     """
     Calculate an earliest start time for a given task.
@@ -183,6 +179,7 @@ cdef class PlatformModel(object):
     * use numpy buffer types to speedup indexing
     * manually inline parent_data_ready_time function (synergistic with numpy usage. passing buffer types is costly for some reason)
     * annotate ALL types
+    * no bounds/wraparound checks on buffer indexing (host indices always come from the host map)
 
     Args:
       host: host on which a new (current) task will be executed
@@ -238,6 +235,8 @@ cdef class PlatformModel(object):
         result = task_ect
     return result
 
+  @cython.boundscheck(False)
+  @cython.wraparound(False)
   cpdef max_comm_time(self, cplatform.Host host, dict tasks, SchedulerState state):
     """
     Get max data transfer time from given tasks to a given host.
@@ -36,8 +36,6 @@ Usage::
       input_size   task input size in bytes
       comp_size    task computational size in flops
       output_size  task output size in bytes
-      output_dir   output directory
-      num_graphs   number of generated graphs
 
     optional arguments:
       -h, --help   show this help message and exit
@@ -45,93 +43,101 @@ Usage::
 
 import argparse
 import os
-import random
 import sys
 
+import numpy as np
 
-def generate_tasks(num_tasks, input_size, comp_size, output_size):
-    tasks = []
-    for i in range(0, num_tasks):
-        task = {
-            'name': "task%d" % i
-        }
-        tasks.append(task)
-
-    # populate task input sizes
-    input_sizes = generate_values(input_size, num_tasks)
-    for i in range(0, num_tasks):
-        tasks[i]['input_size'] = input_sizes[i]
+# number of tasks formatted per write call in save_as_dot_file
+_DOT_WRITE_BLOCK = 4096
 
-    # populate task computational sizes
-    comp_sizes = generate_values(comp_size, num_tasks, input_sizes)
-    for i in range(0, num_tasks):
-        tasks[i]['comp_size'] = comp_sizes[i]
 
-    # populate task output sizes
-    output_sizes = generate_values(output_size, num_tasks, input_sizes)
-    for i in range(0, num_tasks):
-        tasks[i]['output_size'] = output_sizes[i]
+def generate_tasks(input_gen, comp_gen, output_gen, rng, input_sizes, comp_sizes, output_sizes):
+    # size arrays are filled in place, so the same buffers are reused for every graph
+    input_gen(rng, input_sizes)
+    comp_gen(rng, comp_sizes, input_sizes)
+    output_gen(rng, output_sizes, input_sizes)
 
-    return tasks
 
-
-def generate_values(spec, num, inputs=None):
+def compile_spec(spec):
+    # parses the value spec once and returns a generator function
+    # with signature (rng, out, inputs=None) that fills the out array
     try:
         # fixed value
         fixed = float(spec)
-        values = [fixed] * num
-
+        return lambda rng, out, inputs=None: out.fill(fixed)
     except ValueError:
-        parts = spec.split(':')
-        dist_type = parts[0]
-        params = parts[1:]
-
-        # uniform distribution: u:min:max
-        if dist_type == "u":
-            min_value = float(params[0])
-            max_value = float(params[1])
-            values = [random.uniform(min_value, max_value) for _ in range(0, num)]
-
-        # normal distribution: n:mean:std_dev
-        elif dist_type == "n":
-            mean = float(params[0])
-            std_dev = float(params[1])
-            values = [random.normalvariate(mean, std_dev) for _ in range(0, num)]
-
-        # scaled values: x:factor
-        elif dist_type == "x":
-            factor = float(params[0])
-            if inputs is not None:
-                values = [inputs[i] * factor for i in range(0, num)]
-            else:
+        pass
+
+    parts = spec.split(':')
+    dist_type = parts[0]
+    params = parts[1:]
+
+    # uniform distribution: u:min:max
+    if dist_type == "u":
+        min_value = float(params[0])
+        max_value = float(params[1])
+
+        def uniform(rng, out, inputs=None):
+            rng.random(out=out)
+            out *= max_value - min_value
+            out += min_value
+        return uniform
+
+    # normal distribution: n:mean:std_dev
+    elif dist_type == "n":
+        mean = float(params[0])
+        std_dev = float(params[1])
+
+        def normal(rng, out, inputs=None):
+            rng.standard_normal(out=out)
+            out *= std_dev
+            out += mean
+        return normal
+
+    # scaled values: x:factor
+    elif dist_type == "x":
+        factor = float(params[0])
+
+        def scaled(rng, out, inputs=None):
+            if inputs is None:
                 print("Inputs are not specified")
                 sys.exit(-1)
+            np.multiply(inputs, factor, out=out)
+        return scaled
 
-        else:
-            print("Unknown distribution")
-            sys.exit(-1)
-
-    return values
+    else:
+        print("Unknown distribution")
+        sys.exit(-1)
 
 
-def save_as_dot_file(tasks, output_path):
+def save_as_dot_file(names, input_sizes, comp_sizes, output_sizes, output_path):
     with open(output_path, "w") as f:
         f.write("digraph G {\n")
-        for task in tasks:
-            f.write('  root -> %s [size="%e"]\n' % (task['name'], task['input_size']))
-            f.write('  %s [size="%e"]\n' % (task['name'], task['comp_size']))
-            f.write('  %s -> end [size="%e"]\n' % (task['name'], task['output_size']))
+        # tasks are formatted and written in fixed-size blocks to keep
+        # both the number of write calls and the peak memory bounded
+        for start in range(0, len(names), _DOT_WRITE_BLOCK):
+            end = start + _DOT_WRITE_BLOCK
+            f.write("".join(
+                f'  root -> {name} [size="{input_size:e}"]\n'
+                f'  {name} [size="{comp_size:e}"]\n'
+                f'  {name} -> end [size="{output_size:e}"]\n'
+                for name, input_size, comp_size, output_size in zip(
+                    names[start:end], input_sizes[start:end].tolist(),
+                    comp_sizes[start:end].tolist(), output_sizes[start:end].tolist())))
         f.write("}\n")
 
 
 def main(output_dir, num_graphs, seed, num_tasks, input_size, comp_size, output_size):
-    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    input_gen, comp_gen, output_gen = map(compile_spec, (input_size, comp_size, output_size))
+    names = np.char.mod("task%d", np.arange(num_tasks)).tolist()
+    sizes = [np.empty(num_tasks) for _ in range(3)]
     os.mkdir(output_dir)
     for i in range(0, num_graphs):
-        tasks = generate_tasks(num_tasks, input_size, comp_size, output_size)
+        generate_tasks(input_gen, comp_gen, output_gen, rng, *sizes)
         file_name = 'bot_%d_%s_%s_%s_%d.dot' % (num_tasks, input_size, comp_size, output_size, i)
-        file_path = output_dir + '/' + file_name
-        save_as_dot_file(tasks, file_path)
+        file_path = os.path.join(output_dir, file_name)
+        save_as_dot_file(names, *sizes, file_path)
         print('Generated file: %s' % file_path)
     return 0
 
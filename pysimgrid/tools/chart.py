@@ -0,0 +1,189 @@
+# This file is part of pysimgrid, a Python interface to the SimGrid library.
+#
+# Copyright 2015-2016 Alexey Nazarenko and contributors
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# along with this library.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Execution charts for the experiment tool.
+
+Kept apart from the experiment module, so chart rendering workers don't import the simulator.
+"""
+
+import collections
+import logging
+import math
+import ntpath
+import operator
+import re
+
+
+# everything make_chart needs from a finished simulation, as plain picklable data:
+#   hosts are (name, speed), task_rows are (start, finish, host, name), comm_rows are (start, finish, src, dst)
+ChartSpec = collections.namedtuple("ChartSpec", [
+    "platform", "tasks", "algorithm", "makespan", "expected_makespan", "hosts", "task_rows", "comm_rows"
+])
+
+
+def make_chart_spec(simulation, platform, tasks, algorithm, scheduler):
+    return ChartSpec(
+        platform, tasks, algorithm, simulation.clock,
+        scheduler.expected_makespan if scheduler.expected_makespan is not None else math.nan,
+        [(host.name, host.speed) for host in simulation.hosts],
+        [(task.start_time, task.finish_time, task.hosts[0].name, task.name) for task in simulation.tasks],
+        [(comm.start_time, comm.finish_time, comm.hosts[0].name, comm.hosts[1].name)
+         for comm in simulation.connections if len(comm.hosts) == 2]
+    )
+
+
+def make_chart(spec):
+    platform, tasks, algorithm = spec.platform, spec.tasks, spec.algorithm
+    # matplotlib is imported only when charts are requested and only by the chart rendering workers
+    logging.getLogger("matplotlib").setLevel(logging.WARNING)
+    # charts are only saved to files: draw straight on an Agg canvas,
+    # without pyplot state or any GUI backend being loaded
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if 'Montage' in tasks:
+        TASK_COLORS = {
+            'mProject': 'yellow',
+            'mProjectPP': 'yellow',
+            'mDiffFit': 'deepskyblue',
+            'mConcatFit': 'salmon',
+            'mBgModel': 'orange',
+            'mBackground': 'darkgreen',
+            'mImgtbl': 'paleturquoise',
+            'mImgTbl': 'paleturquoise',
+            'mShrink': 'gray',
+            'mAdd': 'orchid',
+            'mJPEG': 'palegreen'
+        }
+    elif '1000Genome' in tasks:
+        TASK_COLORS = {
+            'sifting': 'red',
+            'individuals': 'deepskyblue',
+            'mutation': 'orange',
+            'frequency': 'salmon'
+        }
+    else:
+        TASK_COLORS = [
+            'dodgerblue',
+            'royalblue'
+        ]
+
+    if type(TASK_COLORS) is dict:
+        UPLOAD_COLOR = 'gray'
+        DOWNLOAD_COLOR = 'black'
+
+        task_labels = {}
+        with open(tasks, "r") as f:
+            for line in f:
+                if 'label="' in line:
+                    task_label = line.split('label="')[1].split('"')[0]
+                    task_id = line.split('[')[0].strip()
+                    task_labels[task_id] = task_label
+    else:
+        UPLOAD_COLOR = 'lime'
+        DOWNLOAD_COLOR = 'deeppink'
+
+    params = {'legend.fontsize': 'small',
+              'figure.figsize': (8, 5),
+              'axes.labelsize': 'small',
+              'axes.titlesize': 'small',
+              'xtick.labelsize': 'small',
+              'ytick.labelsize': 'small'}
+    matplotlib.rcParams.update(params)
+
+    platform_name = ntpath.basename(platform).rsplit(".", 1)[0]
+    app_name = ntpath.basename(tasks).rsplit(".", 1)[0]
+    fig_name = "%s_%s_%s" % (platform_name, app_name, algorithm)
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_title("System: %s\nApplication: %s\nAlgorithm: %s\nMakespan: %.2f (%.2f)\n" %
+                 (platform_name, app_name, algorithm, spec.makespan, spec.expected_makespan),
+                 loc='left')
+    ax.margins(x=0)
+
+    # hosts on the chart are sorted by their speed in decreasing order
+    # master is always placed on the top of the chart
+    hosts = sorted(spec.hosts,
+                   key=lambda h: (h[1] if h[0] != 'master' else float('Inf'),
+                                  -int(h[0].replace("host", "")) if h[0] != 'master' else float('Inf')))
+    min_speed = min(speed for _, speed in hosts)
+    host_labels = ["%s (%.1f)" % (name, speed / min_speed) for name, speed in hosts]
+    hosts = [name for name, _ in hosts]
+
+    # remove master from chart if there are no related data transfers
+    master_comm_size = 0
+    for start_time, finish_time, src, dst in spec.comm_rows:
+        if src == 'master' or dst == 'master':
+            master_comm_size += finish_time - start_time
+    if master_comm_size < 1:
+        hosts.remove('master')
+        del host_labels[-1]
+
+    hosts_idx = {host: idx for idx, host in enumerate(hosts)}
+    task_count = len(spec.task_rows)
+    host_task_count = {host: 0 for host in hosts}
+
+    # bars are collected per (row, color) and drawn with a single broken_barh call each
+    task_bars = collections.defaultdict(list)
+    upload_bars = collections.defaultdict(list)
+    download_bars = collections.defaultdict(list)
+
+    # draw task executions
+    task_rows = sorted((row for row in spec.task_rows if row[3] not in ("root", "end")), key=operator.itemgetter(0))
+    for start_time, finish_time, host, name in task_rows:
+        duration = finish_time - start_time
+        idx = hosts_idx[host]
+        host_task_count[host] += 1
+
+        if type(TASK_COLORS) is dict:
+            task_group = task_labels[name].split("_")[0]
+            task_color = TASK_COLORS[task_group]
+        else:
+            task_color = TASK_COLORS[host_task_count[host] % 2]
+
+        task_bars[idx, task_color].append((start_time, duration))
+
+        # draw task names only for small apps
+        if task_count <= 10:
+            ax.text(start_time + duration / 2.0, idx, re.sub('[^0-9]', '', name),
+                    ha='center', va='center', color='white')
+
+    # draw data transfers
+    for start_time, finish_time, src, dst in spec.comm_rows:
+        if src != dst:
+            duration = finish_time - start_time
+            if duration > 0.1:
+                upload_bars[hosts_idx[src]].append((start_time, duration))
+                download_bars[hosts_idx[dst]].append((start_time, duration))
+
+    for (idx, color), xranges in task_bars.items():
+        ax.broken_barh(xranges, (idx - 0.4, 0.8), color=color, linewidth=0)
+    for idx, xranges in upload_bars.items():
+        ax.broken_barh(xranges, (idx + 0.2, 0.2), color=UPLOAD_COLOR, linewidth=0)
+    for idx, xranges in download_bars.items():
+        ax.broken_barh(xranges, (idx - 0.4, 0.2), color=DOWNLOAD_COLOR, linewidth=0)
+
+    ax.set_yticks(range(len(hosts)))
+    ax.set_yticklabels(host_labels)
+    ax.set_xlabel("time")
+    fig.tight_layout()
+    fig.savefig(fig_name + ".png", dpi=400)
@@ -43,8 +43,8 @@ Usage::
                       [--maxdata [MAXDATA [MAXDATA ...]]]
                       [--ccr [CCR [CCR ...]]]
                       [--repeat REPEAT]
-                      [--seed SEED]
-                      daggen_path output_dir
+                      [--seed SEED] [-j JOBS]
+                      output_dir
 
     Synthetic DAG generator
 
@@ -73,87 +73,117 @@ Usage::
                             communication-to-computation ratio in MBs/Gflops
       --repeat REPEAT       number of random graphs for each configuration
       --seed SEED           random seed
+      -j JOBS, --jobs JOBS  number of parallel jobs to run
+                            (default: number of CPUs)
 """
 
 import argparse
+import concurrent.futures
+import io
 import itertools
 import networkx as nx
+import numpy as np
 import os
-import random
+import re
 import subprocess
 
+_ROOT_END = frozenset(("root", "end"))
+_DAGGEN_PIPE_BUFFER = 1 << 16
+# node lines are fully validated by the match itself, including the node type.
+# DAGGEN output is plain ASCII, so Unicode character classes are not needed
+_DAGGEN_NODE_REGEX = re.compile(r"NODE (\d+) (\S+) (ROOT|END|COMPUTATION|TRANSFER) (\S+) (\S+)\s*$", re.ASCII)
+
 
 def import_daggen(line_iter):
-    _NODE_TYPES = {"ROOT", "END", "COMPUTATION", "TRANSFER"}
     result = nx.DiGraph()
-    nodes = {}
+    # node attributes are kept in parallel lists indexed by the order nodes appear in,
+    # DAGGEN ids are only used to find that index
+    node_index = {}
+    types = []
+    children_lists = []
+    costs = []
+    task_names = {}
+    # edges leaving task nodes as (parent index, child DAGGEN id),
+    # resolved once all TRANSFER nodes are known
+    pending_edges = []
+    task_nodes = []
+    root_idx = None
     skip = True
     for line in line_iter:
-        line = line.strip()
-        if line.startswith("NODE_COUNT"):
-            skip = False
+        if skip:
+            skip = not line.startswith("NODE_COUNT")
             continue
-        if skip or not line:
+        match = _DAGGEN_NODE_REGEX.match(line)
+        if match is None:
+            assert not line.strip(), "unexpected DAGGEN line: %r" % line
             continue
-        node_parts = line.split(" ")
-        assert len(node_parts) == 6
-        magic, nodeid, children, nodetype, cost, parallel_ratio = node_parts
-        assert magic == "NODE"
-        nodeid = int(nodeid)
-        children = list(map(int, children.split(","))) if children != "-" else []
-        assert nodetype in _NODE_TYPES
+        # parallel ratio (last field) is unused for now
+        nodeid, children, nodetype, cost, _ = match.groups()
+        if children == "-":
+            children = []
+        elif "," in children:
+            children = np.fromstring(children, dtype=np.int64, sep=",").tolist()
+        else:
+            children = [int(children)]
         cost = float(cost)
-        # unused_for_now
-        parallel_ratio = float(parallel_ratio)
-        nodes[nodeid] = (nodetype, children, cost)
-    task_ids = {}
-    task_count = 0
-    node_mapper = lambda nid: "task_%d" % task_ids[nid]
-    for nodeid, (nodetype, _, cost) in nodes.items():
-        if nodetype != "TRANSFER":
-            task_ids[nodeid] = task_count
-            task_count += 1
-            result.add_node(node_mapper(nodeid), weight=cost)
-    for nodeid, (nodetype, children, _) in nodes.items():
+        idx = node_index[int(nodeid)] = len(types)
+        types.append(nodetype)
+        children_lists.append(children)
+        costs.append(cost)
         if nodetype == "TRANSFER":
             continue
-        for childid in children:
-            childtype, grandchildren, transfercost = nodes[childid]
-            if childtype == "TRANSFER":
-                assert len(grandchildren) == 1
-                destination = grandchildren[0]
-                weight = transfercost
-            else:
-                assert nodetype == "ROOT" or childtype == "END"
-                destination = childid
-                # TODO: Should be 0.
-                #
-                # Kludge to force order in 3rd-party HEFT implementation
-                # (nodes connected by edges with zero weight get mixed
-                #  in HEFT priority list and violate precedence constraints)
-                #
-                # Can be removed as I can fix this BS in my HEFT
-                weight = 1.
-            result.add_edge(node_mapper(nodeid), node_mapper(destination), weight=weight)
-    node_order = list(nx.topological_sort(result))
-    return nx.relabel_nodes(result, {
-        node_order[0]: "root",
-        node_order[-1]: "end"
-    })
-
-
-def compute_weights(graph, mindata, maxdata, ccr, scatter_gather=False):
+        # entry and exit tasks are named right away, so the graph never needs relabeling
+        if nodetype == "ROOT":
+            name = "root"
+            root_idx = idx
+        elif nodetype == "END":
+            name = "end"
+        else:
+            name = "task_%d" % len(task_names)
+        task_names[idx] = name
+        task_nodes.append((name, {"weight": cost}))
+        pending_edges.extend((idx, childid) for childid in children)
+    edges = []
+    for idx, childid in pending_edges:
+        child_idx = node_index[childid]
+        if types[child_idx] == "TRANSFER":
+            grandchildren = children_lists[child_idx]
+            assert len(grandchildren) == 1
+            destination = node_index[grandchildren[0]]
+            weight = costs[child_idx]
+        else:
+            assert idx == root_idx or types[child_idx] == "END"
+            destination = child_idx
+            # TODO: Should be 0.
+            #
+            # Kludge to force order in 3rd-party HEFT implementation
+            # (nodes connected by edges with zero weight get mixed
+            #  in HEFT priority list and violate precedence constraints)
+            #
+            # Can be removed as I can fix this BS in my HEFT
+            weight = 1.
+        edges.append((task_names[idx], task_names[destination], weight))
+    result.add_nodes_from(task_nodes)
+    result.add_weighted_edges_from(edges)
+    return result
+
+
+def compute_weights(graph, mindata, maxdata, ccr, scatter_gather=False, rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
     # converting CCR from MBytes/GFlops to bytes/flops
     ccr = ccr / 1000.0
-    for node in graph:
-        if node in ["root", "end"]:
-            continue
-        input_size = random.uniform(mindata, maxdata)
-        num_parents = len(graph.pred[node].values())
-        edge_size = input_size / num_parents
-        for edge in graph.pred[node].values():
+    nodes = [node for node in graph if node not in _ROOT_END]
+    preds = [graph.pred[node] for node in nodes]
+    input_sizes = rng.uniform(mindata, maxdata, len(nodes))
+    num_parents = np.fromiter(map(len, preds), dtype=np.int64, count=len(nodes))
+    edge_sizes = (input_sizes / num_parents).tolist()
+    comp_sizes = (input_sizes / ccr).tolist()
+    node_data = graph.nodes
+    for node, node_preds, comp_size, edge_size in zip(nodes, preds, comp_sizes, edge_sizes):
+        for edge in node_preds.values():
             edge["weight"] = edge_size
-        graph.node[node]["weight"] = input_size / ccr
+        node_data[node]["weight"] = comp_size
     if not scatter_gather:
         # root -> x edges are effectively zero
         for edge in graph.succ["root"].values():
@@ -164,7 +194,7 @@ def compute_weights(graph, mindata, maxdata, ccr, scatter_gather=False):
     return graph
 
 
-def daggen(daggen_path, n, fat, regular, density, jump, mindata, maxdata, ccr):
+def daggen(daggen_path, n, fat, regular, density, jump, mindata, maxdata, ccr, rng=None):
     daggen_path = os.path.normpath(daggen_path)
     params = [
         ("-n", n),
@@ -179,12 +209,38 @@ def daggen(daggen_path, n, fat, regular, density, jump, mindata, maxdata, ccr):
     for name, value in params:
         args.append(name)
         args.append(str(value))
-    kwargs = {}
-    if hasattr(subprocess, "DEVNULL"):
-        kwargs["stderr"] = subprocess.DEVNULL
-    output = subprocess.check_output(args, **kwargs)
-    graph = import_daggen(output.decode("ascii").split("\n"))
-    return compute_weights(graph, mindata, maxdata, ccr)
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=_DAGGEN_PIPE_BUFFER) as proc:
+        graph = import_daggen(io.TextIOWrapper(proc.stdout, encoding="ascii"))
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+    return compute_weights(graph, mindata, maxdata, ccr, rng=rng)
+
+
+def save_as_dot_file(graph, output_path):
+    # walk the adjacency dicts directly: edge data views would build
+    # a tuple and do a default-aware attribute lookup for every edge
+    parts = ["digraph G {\n"]
+    parts.extend(f'  {node} [size="{data["weight"]:e}"];\n' for node, data in graph.nodes.items())
+    parts.append("\n")
+    for src, successors in graph.succ.items():
+        parts.extend(f'  {src} -> {dst} [size="{data["weight"]:e}"];\n' for dst, data in successors.items())
+    parts.append("}\n")
+    with open(output_path, "w") as output_file:
+        output_file.write("".join(parts))
+
+
+def _generate_graph(job):
+    daggen_path, config, seed, output_path = job
+    graph = daggen(daggen_path, *config, rng=np.random.default_rng(seed))
+    save_as_dot_file(graph, output_path)
+    return output_path
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("expected a positive integer, got %s" % value)
+    return number
 
 
 def main():
@@ -211,6 +267,8 @@ def main():
                         help="number of random graphs for each configuration")
     parser.add_argument("--seed", type=int, default=314,
                         help="random seed")
+    parser.add_argument("-j", "--jobs", type=_positive_int, default=os.cpu_count() or 1,
+                        help="number of parallel jobs to run")
 
     args = parser.parse_args()
 
@@ -219,23 +277,18 @@ def main():
     if not os.path.exists(args.output_dir):
         os.makedirs(args.output_dir)
 
-    seed = args.seed
-    random.seed(seed)
-
+    jobs = []
     for config in itertools.product(args.count, args.fat, args.regular, args.density, args.jump,
                                     args.mindata, args.maxdata, args.ccr):
         for repeat_idx in range(args.repeat):
-            graph = daggen(daggen_path, *config)
             output_filename = "daggen_%d_%.2f_%.2f_%.2f_%d_%1.0e_%1.0e_%.2f_%d.dot" % (config + (repeat_idx,))
-            with open(os.path.join(args.output_dir, output_filename), "w") as output_file:
-                output_file.write("digraph G {\n")
-                for node, data in graph.nodes(True):
-                    output_file.write('  %s [size="%e"];\n' % (node, data["weight"]))
-                output_file.write("\n")
-                for src, dst, data in graph.edges(data='weight'):
-                    output_file.write('  %s -> %s [size="%e"];\n' % (src, dst, data))
-                output_file.write("}\n")
-            print("Generated %s" % output_filename)
+            # each graph gets its own seed, so weights don't depend on the order jobs are executed in
+            graph_seed = [args.seed, len(jobs)]
+            jobs.append((daggen_path, config, graph_seed, os.path.join(args.output_dir, output_filename)))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for output_path in executor.map(_generate_graph, jobs, chunksize=4):
+            print("Generated %s" % os.path.basename(output_path))
 
 
 if __name__ == "__main__":
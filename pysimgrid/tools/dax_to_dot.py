@@ -1,4 +1,5 @@
 import argparse
+import functools
 import networkx as nx
 
 from collections import defaultdict
@@ -9,6 +10,7 @@ except ImportError:
     import xml.etree.ElementTree as ET
 
 
+@functools.lru_cache(maxsize=32)
 def strip_namespace(tag):
     if '}' in tag:
         tag = tag.split('}', 1)[1]
@@ -16,16 +18,21 @@ def strip_namespace(tag):
 
 
 class Task:
-    def __init__(self, id, name, runtime, input_files={}, output_files={}):
+    __slots__ = ("id", "name", "runtime", "input_files", "output_files", "parents")
+
+    def __init__(self, id, name, runtime, input_files=None, output_files=None):
         self.id = id
         self.name = name
         self.runtime = runtime
-        self.input_files = input_files
-        self.output_files = output_files
+        # defaults are created per instance: root and end tasks get files added to them later
+        self.input_files = {} if input_files is None else input_files
+        self.output_files = {} if output_files is None else output_files
         self.parents = set()
 
 
 class File:
+    __slots__ = ("name", "size", "transfer")
+
     def __init__(self, name, size, transfer):
         self.name = name
         self.size = size
@@ -40,10 +47,11 @@ def main():
                         help="host speed in flop/s used to convert task runtime to flop, "
                              "default value is 4200000000 (see simdag/sd_daxloader.cpp)")
     parser.add_argument("--no-boundary", action="store_true", default=False, help="omit root and end tasks")
+    parser.add_argument("--validate", action="store_true", default=False,
+                        help="check that graph edges match the declared task dependencies")
 
     args = parser.parse_args()
 
-    tree = ET.parse(args.input_file)
     tasks = {}
     file_producers = defaultdict(list)
     file_consumers = defaultdict(list)
@@ -53,17 +61,32 @@ def main():
     tasks[root.id] = root
     tasks[end.id] = end
 
-    for el in tree.getroot():
-        tag = strip_namespace(el.tag)
-        if tag == 'job':
+    # each top-level element is processed on its end event and then dropped
+    dax_root = None
+    for event, el in ET.iterparse(args.input_file, events=("start", "end")):
+        if event == "start":
+            if dax_root is None:
+                dax_root = el
+                # all DAX elements share the root namespace, so tags are compared
+                # against precomputed qualified names
+                namespace = el.tag[:el.tag.rfind('}') + 1]
+                job_tag = namespace + 'job'
+                uses_tag = namespace + 'uses'
+                child_tag = namespace + 'child'
+                parent_tag = namespace + 'parent'
+            continue
+        tag = el.tag
+        if tag != job_tag and tag != child_tag:
+            # fall back to namespace-agnostic matching for foreign-namespace elements
+            tag = namespace + strip_namespace(tag)
+        if tag == job_tag:
             task_id = el.attrib['id']
             task_name = el.attrib['name']
             runtime = float(el.attrib['runtime'])
             input_files = {}
             output_files = {}
             for sub_el in el:
-                sub_tag = strip_namespace(sub_el.tag)
-                if sub_tag == 'uses':
+                if sub_el.tag == uses_tag or strip_namespace(sub_el.tag) == 'uses':
                     file_name = sub_el.attrib['file']
                     file_size = float(sub_el.attrib['size'])
                     link = sub_el.attrib['link']
@@ -83,26 +106,23 @@ def main():
             assert task_id not in tasks, "Duplicate task id"
             tasks[task_id] = task
             # dag.add_node(task, weight=task.runtime)
-        elif tag == 'child':
+        elif tag == child_tag:
             task = tasks[el.attrib['ref']]
             for sub_el in el:
-                sub_tag = strip_namespace(sub_el.tag)
-                if sub_tag == 'parent':
+                if sub_el.tag == parent_tag or strip_namespace(sub_el.tag) == 'parent':
                     parent = tasks[sub_el.attrib['ref']]
                     task.parents.add(parent.id)
+        else:
+            continue
+        dax_root.clear()
 
-    dag = nx.DiGraph()
-
-    for task in tasks.values():
-        weight = task.runtime * args.speed
-        dag.add_node(task, weight=weight)
+    edge_weights = {}
 
     for task in tasks.values():
         for file in task.input_files.values():
-            if file.name in file_producers:
-                # assert file.transfer == 'false'
-                producers = file_producers[file.name]
-            else:
+            # get() doesn't insert into the defaultdict
+            producers = file_producers.get(file.name)
+            if producers is None:
                 # input files not produced in DAG are outputs of the end task
                 # assert file.transfer == 'true', 'Wrong file transfer for file %s in task %s?' % (file.name, task.id)
                 root = tasks['root']
@@ -126,51 +146,64 @@ def main():
                     # pysimgrid does not support multigraphs, i.e. multiple data transfers between same tasks
                     # (see simulation.get_task_graph())
                     # therefore multiple data transfers are converted to a single edge with total data size
-                    if not dag.has_edge(parent, task):
-                        dag.add_edge(parent, task, weight=weight)
+                    edge = (parent, task)
+                    if edge not in edge_weights:
+                        edge_weights[edge] = weight
                     else:
                         print("!!! Duplicate edge: %s -> %s" % (parent.id, task.id))
-                        dag[parent][task]['weight'] += weight
+                        edge_weights[edge] += weight
 
         # output files not consumed in DAG are inputs to the end task
         for file in task.output_files.values():
-            if file.name not in file_consumers or len(file_consumers[file.name]) == 0:
+            # consumer lists are only ever appended to, so a listed file always has consumers
+            if file.name not in file_consumers:
                 assert file.transfer == 'true'
-                if not dag.has_edge(task, tasks['end']):
-                    dag.add_edge(task, tasks['end'], weight=file.size)
+                edge = (task, tasks['end'])
+                if edge not in edge_weights:
+                    edge_weights[edge] = file.size
                     tasks['end'].parents.add(task.id)
                 else:
-                    dag[task][tasks['end']]['weight'] += file.size
+                    edge_weights[edge] += file.size
             # else:
             #     assert file.transfer == 'false', 'Wrong file transfer for file %s in task %s?' % (file.name, task.id)
 
+    if args.validate:
         # check that edges for all parent tasks exist
-        for parent_id in task.parents:
-            parent = tasks[parent_id]
-            assert dag.has_edge(parent, task), "Non-data dependency: %s -> %s" % (parent_id, task.id)
+        for task in tasks.values():
+            for parent_id in task.parents:
+                parent = tasks[parent_id]
+                assert (parent, task) in edge_weights, "Non-data dependency: %s -> %s" % (parent_id, task.id)
 
         # check that no edges for non-parent tasks exist
-        for src, dst in dag.edges():
+        for src, dst in edge_weights:
             assert src.id in dst.parents, "Wrong edge, %s is not parent of %s" % (src.id, dst.id)
 
+    dag = nx.DiGraph()
+    dag.add_nodes_from((task, {"weight": task.runtime * args.speed}) for task in tasks.values())
+    dag.add_weighted_edges_from((src, dst, weight) for (src, dst), weight in edge_weights.items())
+
+    parts = [
+        'digraph DAG {\n',
+        '  ranksep=5.0\n',
+        '  node [style=filled,color="#444444",fillcolor="#ffed6f"]\n',
+        '  edge [arrowhead=normal,arrowsize=1.0]\n',
+        '\n'
+    ]
+    for task, data in dag.nodes(True):
+        if not args.no_boundary or task.id not in ['root', 'end']:
+            if task.name != task.id:
+                task_label = task.name + "_" + task.id
+            else:
+                task_label = task.name
+            parts.append(f'  {task.id} [label="{task_label}",size="{data["weight"]:e}"];\n')
+    parts.append("\n")
+    for src, dst, data in dag.edges(data='weight'):
+        if not args.no_boundary or (src.id not in ['root', 'end'] and dst.id not in ['root', 'end']):
+            parts.append(f'  {src.id} -> {dst.id} [size="{data:e}"];\n')
+    parts.append("}\n")
+
     with open(args.output_file, 'w') as out:
-        out.write('digraph DAG {\n')
-        out.write('  ranksep=5.0\n')
-        out.write('  node [style=filled,color="#444444",fillcolor="#ffed6f"]\n')
-        out.write('  edge [arrowhead=normal,arrowsize=1.0]\n')
-        out.write("\n")
-        for task, data in dag.nodes(True):
-            if not args.no_boundary or task.id not in ['root', 'end']:
-                if task.name != task.id:
-                    task_label = task.name + "_" + task.id
-                else:
-                    task_label = task.name
-                out.write('  %s [label="%s",size="%e"];\n' % (task.id, task_label, data["weight"]))
-        out.write("\n")
-        for src, dst, data in dag.edges(data='weight'):
-            if not args.no_boundary or (src.id not in ['root', 'end'] and dst.id not in ['root', 'end']):
-                out.write('  %s -> %s [size="%e"];\n' % (src.id, dst.id, data))
-        out.write("}\n")
+        out.write("".join(parts))
 
 
 if __name__ == "__main__":
@@ -24,12 +24,24 @@ class AccurateEstimator(Estimator):
 
 class SimpleDispersionEstimator(Estimator):
 
+    # number of uniform samples drawn from the generator at once
+    _BATCH_SIZE = 8192
+
     def __init__(self, percentage, seed=1234):
         self.percentage = percentage
-        np.random.seed(seed)
+        # per-instance generator: its state travels with the estimator to worker processes,
+        # unlike the global numpy RNG which is not seeded there at all
+        self._rng = np.random.default_rng(seed)
+        self._samples = []
+        self._next_sample = 0
         super().__init__()
 
     def generate(self, value):
         low = max(float(value * (1. - self.percentage)), 1.0)
         high = max(float(value * (1. + self.percentage)), 1.0)
-        return np.random.uniform(low, high)
+        if self._next_sample == len(self._samples):
+            self._samples = self._rng.random(self._BATCH_SIZE).tolist()
+            self._next_sample = 0
+        sample = self._samples[self._next_sample]
+        self._next_sample += 1
+        return low + (high - low) * sample
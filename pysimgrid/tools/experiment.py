@@ -24,6 +24,7 @@ Usage::
     python -m pysimgrid.tools.experiment [-h] [-j JOBS] [-l {debug,info,warning,error,critical}]
                          [--simgrid-log-level {trace,debug,verbose,info,warning,error,critical}]
                          [--stop-on-error] [--algo [ALGO [ALGO ...]]]
+                         [--estimator ESTIMATOR] [--make-charts] [--format {json,jsonl}]
                          platforms tasks algorithms output
 
     positional arguments:
@@ -47,6 +48,11 @@ Usage::
                             still be defined in algorithms file)
       --estimator           estimator to generate estimates (Accurate, SimpleDispersion:percentage)
       --make-charts         generate chart for each execution
+      --format {json,jsonl}
+                            output format: JSON list or JSON lines, both written
+                            as results arrive (only the latter stays valid if the
+                            run is interrupted; it can be converted to the former
+                            with `jq -s . output.jsonl`)
 """
 
 from __future__ import print_function
@@ -54,21 +60,17 @@ from __future__ import print_function
 import argparse
 import datetime
 import fnmatch
+import importlib
 import itertools
 import json
 import logging
-import math
 import multiprocessing
-import ntpath
 import os
 import re
 import textwrap
 import time
 
-logging.getLogger("matplotlib").setLevel(logging.WARNING)
-import matplotlib.pyplot as plt
-import matplotlib.pylab as pylab
-
+from .chart import make_chart, make_chart_spec
 from .estimator import AccurateEstimator, SimpleDispersionEstimator
 from .. import simdag
 
@@ -90,6 +92,8 @@ _LOG_LEVEL_FROM_STRING = {
     "error": logging.ERROR,
     "critical": logging.CRITICAL
 }
+# weight of the latest result in the progress ETA moving average
+_ETA_SMOOTHING = 0.1
 
 
 class NoDaemonProcess(multiprocessing.context.SpawnProcess):
@@ -113,36 +117,40 @@ def file_list(file_or_dir, masks=["*"]):
     if not os.path.exists(file_or_dir):
         raise Exception("path %s does not exist" % file_or_dir)
     if os.path.isdir(file_or_dir):
-        result = []
-        for fname in os.listdir(file_or_dir):
-            fpath = os.path.join(file_or_dir, fname)
-            if os.path.isfile(fpath):
-                if any((fnmatch.fnmatch(fname, pattern) for pattern in masks)):
-                    result.append(os.path.join(file_or_dir, fname))
-            else:
-                result.extend(file_list(fpath, masks))
-        return result
+        mask_regex = re.compile("|".join(fnmatch.translate(mask) for mask in masks))
+        return _scan_dir(file_or_dir, mask_regex)
     else:
         return [os.path.abspath(file_or_dir)]
 
 
+def _scan_dir(path, mask_regex):
+    result = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                if mask_regex.match(entry.name):
+                    result.append(entry.path)
+            elif entry.is_dir():
+                result.extend(_scan_dir(entry.path, mask_regex))
+    return result
+
+
 def import_algorithm(algorithm):
-    name_parts = algorithm.split(".")
-    module_name = ".".join(name_parts[:-1])
-    module = __import__(module_name)
-    result = module
-    for name in name_parts[1:]:
-        result = getattr(result, name)
+    module_name, class_name = algorithm.rsplit(".", 1)
+    result = getattr(importlib.import_module(module_name), class_name)
     assert isinstance(result, type)
     return result
 
 
+def _init_worker(log_level):
+    logging.basicConfig(level=log_level, format=_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT)
+
+
 def run_experiment(job):
     platform, tasks, estimator, algorithm, config = job
     python_log_level, simgrid_log_level = config["log_level"], config["simgrid_log_level"]
     stop_on_error = config["stop_on_error"]
     make_charts = config["make_charts"]
-    logging.basicConfig(level=config["log_level"], format=_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT)
     logger = logging.getLogger("pysimgrid.tools.Experiment")
     logger.debug("Starting experiment (platform=%s, tasks=%s, algorithm=%s)", platform, tasks, algorithm["class"])
     scheduler_class = import_algorithm(algorithm["class"])
@@ -150,20 +158,21 @@ def run_experiment(job):
         os.environ["PYSIMGRID_DATA_TRANSFER"] = algorithm["data-transfer-mode"]
     # init return values with NaN's
     makespan, exec_time, comm_time, sched_time, exp_makespan = [float("NaN")] * 5
+    chart_spec = None
     try:
         with simdag.Simulation(platform, tasks, estimator,
                                log_config="root.threshold:" + simgrid_log_level) as simulation:
             scheduler = scheduler_class(simulation)
             scheduler.run()
             makespan = simulation.clock
-            exec_time = sum([t.finish_time - t.start_time for t in simulation.tasks])
+            exec_time = sum(t.finish_time - t.start_time for t in simulation.tasks)
             comm_time = sum(
-                [t.finish_time - t.start_time for t in simulation.all_tasks[simdag.TaskKind.TASK_KIND_COMM_E2E]])
+                t.finish_time - t.start_time for t in simulation.all_tasks[simdag.TaskKind.TASK_KIND_COMM_E2E])
             sched_time = scheduler.scheduler_time
             if scheduler.expected_makespan is not None:
                 exp_makespan = scheduler.expected_makespan
             if make_charts:
-                make_chart(simulation, platform, tasks, algorithm["name"], scheduler)
+                chart_spec = make_chart_spec(simulation, platform, tasks, algorithm["name"], scheduler)
     except Exception:
         # output is not pretty, but complete and robust. it is a crash anyway.
         #   note the wrapping of job into a tuple
@@ -172,157 +181,28 @@ def run_experiment(job):
             raise Exception(message)
         else:
             logger.exception(message)
-    return job, makespan, exec_time, comm_time, sched_time, exp_makespan
+    return job, makespan, exec_time, comm_time, sched_time, exp_makespan, chart_spec
 
 
 def progress_reporter(iterable, length, logger):
     start_time = last_result_timestamp = time.time()
+    # ETA is based on an exponential moving average of the time between results,
+    # so it follows changes in job duration over a long batch
     average_time = 0.
+    info_enabled = logger.isEnabledFor(logging.INFO)
     for idx, element in enumerate(iterable):
         current = time.time()
         elapsed = current - last_result_timestamp
         last_result_timestamp = current
-        count = idx + 1
-        average_time = average_time * (count - 1) / float(count) + elapsed / count
-        remaining = (length - idx) * average_time
-        eta_string = (" [ETA: %s]" % datetime.timedelta(seconds=remaining)) if idx > 10 else ""
-        logger.info("%d/%d%s", idx + 1, length, eta_string)
+        average_time = elapsed if idx == 0 else (1. - _ETA_SMOOTHING) * average_time + _ETA_SMOOTHING * elapsed
+        if info_enabled:
+            remaining = (length - idx) * average_time
+            eta_string = (" [ETA: %s]" % datetime.timedelta(seconds=remaining)) if idx > 10 else ""
+            logger.info("%d/%d%s", idx + 1, length, eta_string)
         yield element
     logger.info("Finished. %d experiments in %f seconds", length, time.time() - start_time)
 
 
-def make_chart(simulation, platform, tasks, algorithm, scheduler):
-    if 'Montage' in tasks:
-        TASK_COLORS = {
-            'mProject': 'yellow',
-            'mProjectPP': 'yellow',
-            'mDiffFit': 'deepskyblue',
-            'mConcatFit': 'salmon',
-            'mBgModel': 'orange',
-            'mBackground': 'darkgreen',
-            'mImgtbl': 'paleturquoise',
-            'mImgTbl': 'paleturquoise',
-            'mShrink': 'gray',
-            'mAdd': 'orchid',
-            'mJPEG': 'palegreen'
-        }
-    elif '1000Genome' in tasks:
-        TASK_COLORS = {
-            'sifting': 'red',
-            'individuals': 'deepskyblue',
-            'mutation': 'orange',
-            'frequency': 'salmon'
-        }
-    else:
-        TASK_COLORS = [
-            'dodgerblue',
-            'royalblue'
-        ]
-
-    if type(TASK_COLORS) is dict:
-        UPLOAD_COLOR = 'gray'
-        DOWNLOAD_COLOR = 'black'
-
-        task_labels = {}
-        with open(tasks, "r") as f:
-            for line in f:
-                if 'label="' in line:
-                    task_label = line.split('label="')[1].split('"')[0]
-                    task_id = line.split('[')[0].strip()
-                    task_labels[task_id] = task_label
-    else:
-        UPLOAD_COLOR = 'lime'
-        DOWNLOAD_COLOR = 'deeppink'
-
-    params = {'legend.fontsize': 'small',
-              'figure.figsize': (8, 5),
-              'axes.labelsize': 'small',
-              'axes.titlesize': 'small',
-              'xtick.labelsize': 'small',
-              'ytick.labelsize': 'small'}
-    pylab.rcParams.update(params)
-
-    platform_name = ntpath.basename(platform).rsplit(".", 1)[0]
-    app_name = ntpath.basename(tasks).rsplit(".", 1)[0]
-    fig_name = "%s_%s_%s" % (platform_name, app_name, algorithm)
-
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    plt.title("System: %s\nApplication: %s\nAlgorithm: %s\nMakespan: %.2f (%.2f)\n" %
-              (platform_name, app_name, algorithm, simulation.clock,
-               scheduler.expected_makespan if scheduler.expected_makespan is not None else math.nan),
-              loc='left')
-    plt.margins(x=0)
-
-    # hosts on the chart are sorted by their speed in decreasing order
-    # master is always placed on the top of the chart
-    hosts = sorted(simulation.hosts,
-                   key=lambda h: (h.speed if h.name != 'master' else float('Inf'),
-                                  -int(h.name.replace("host", "")) if h.name != 'master' else float('Inf')))
-    min_speed = min(hosts, key=lambda h: h.speed).speed
-    host_labels = ["%s (%.1f)" % (host.name, host.speed / min_speed) for host in hosts]
-    hosts = [host.name for host in hosts]
-
-    # remove master from chart if there are no related data transfers
-    master_comm_size = 0
-    for comm in simulation.connections:
-        if len(comm.hosts) != 2:
-            continue
-        src = comm.hosts[0].name
-        dst = comm.hosts[1].name
-        if src == 'master' or dst == 'master':
-            master_comm_size += comm.finish_time - comm.start_time
-    if master_comm_size < 1:
-        hosts.remove('master')
-        del host_labels[-1]
-
-    hosts_idx = {host: idx for idx, host in enumerate(hosts)}
-    task_count = len(simulation.tasks)
-    host_task_count = {host: 0 for host in hosts}
-
-    # draw task executions
-    for task in sorted(simulation.tasks, key=lambda t: t.start_time):
-        host = task.hosts[0].name
-        duration = task.finish_time - task.start_time
-        if task.name not in ["root", "end"]:
-            idx = hosts_idx[host]
-            host_task_count[host] += 1
-
-            if type(TASK_COLORS) is dict:
-                task_group = task_labels[task.name].split("_")[0]
-                task_color = TASK_COLORS[task_group]
-            else:
-                task_color = TASK_COLORS[host_task_count[host] % 2]
-
-            ax.broken_barh([(task.start_time, duration)], (idx - 0.4, 0.8), color=task_color, linewidth=0)
-
-            # draw task names only for small apps
-            if task_count <= 10:
-                ax.text(task.start_time + duration / 2.0, idx, re.sub('[^0-9]', '', task.name),
-                        ha='center', va='center', color='white')
-
-    # draw data transfers
-    for comm in simulation.connections:
-        if len(comm.hosts) != 2:
-            continue
-        src = comm.hosts[0].name
-        dst = comm.hosts[1].name
-        if src != dst:
-            duration = comm.finish_time - comm.start_time
-            if duration > 0.1:
-                ax.broken_barh([(comm.start_time, duration)], (hosts_idx[src] + 0.2, 0.2),
-                               color=UPLOAD_COLOR, linewidth=0)
-                ax.broken_barh([(comm.start_time, duration)], (hosts_idx[dst] - 0.4, 0.2),
-                               color=DOWNLOAD_COLOR, linewidth=0)
-
-    ax.set_yticks(range(len(hosts)))
-    ax.set_yticklabels(host_labels)
-    ax.set_xlabel("time")
-    plt.tight_layout()
-    fig = plt.gcf()
-    fig.savefig(fig_name + ".png", dpi=400)
-
-
 def main():
     parser = argparse.ArgumentParser(description="Run experiments for a set of scheduling algorithms")
     parser.add_argument("platforms", type=str, help="path to file or directory containing platform definitions (*.xml)")
@@ -342,6 +222,9 @@ def main():
     parser.add_argument("--estimator", type=str,
                         help="estimator to generate estimates (Accurate, SimpleDispersion:percentage)")
     parser.add_argument("--make-charts", action="store_true", default=False, help="generate chart for each execution")
+    parser.add_argument("--format", type=str, choices=["json", "jsonl"], default="json",
+                        help="output format: JSON list or JSON lines, both written as results arrive "
+                             "(only the latter stays valid if the run is interrupted)")
     args = parser.parse_args()
 
     logging.basicConfig(level=_LOG_LEVEL_FROM_STRING[args.log_level], format=_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT)
@@ -378,16 +261,16 @@ def main():
         else:
             raise Exception("Unknown estimator")
 
-    config = [{
+    config = {
         "stop_on_error": args.stop_on_error,
         "log_level": _LOG_LEVEL_FROM_STRING[args.log_level],
         "simgrid_log_level": args.simgrid_log_level,
         "make_charts": args.make_charts
-    }]
+    }
 
-    # convert to list just get length nicely
-    #   can be left as an iterator, but memory should not be the issue
-    jobs = list(itertools.product(platforms, tasks, [estimator], algorithms, config))
+    # jobs are produced lazily, the count is known from the inputs anyway
+    jobs = itertools.product(platforms, tasks, [estimator], algorithms, [config])
+    job_count = len(platforms) * len(tasks) * len(algorithms)
 
     # report experiment setup
     #   looks scary, but it's probably a shortest way to do this in terms of LOC
@@ -408,12 +291,11 @@ def main():
 
     Configuration:
   %s
-  """) % (len(jobs), args.platforms, len(platforms), args.tasks, len(tasks), args.estimator, len(algorithms),
+  """) % (job_count, args.platforms, len(platforms), args.tasks, len(tasks), args.estimator, len(algorithms),
           "\n".join(["    " + a["name"] for a in algorithms]),
-          "\n".join(["    %s: %s" % (k, v) for k, v in config[0].items()])
+          "\n".join(["    %s: %s" % (k, v) for k, v in config.items()])
           ))
 
-    results = []
     # using the spawn context is important
     #    by default, multiprocessing uses fork, which conflicts with coolhacks inside SimGrid/XBT (library constructors)
     # in more details:
@@ -421,23 +303,58 @@ def main():
     #    'fork' doesn't lead to the reinit
     #    SimGrid crashes on unitialized TLS
     ctx = multiprocessing.get_context("spawn")
-    with NoDaemonPool(processes=args.jobs, maxtasksperchild=1, context=ctx) as pool:
-        for job, makespan, exec_time, comm_time, sched_time, exp_makespan in progress_reporter(
-                pool.imap_unordered(run_experiment, jobs, 1), len(jobs), logger):
-            platform, tasks, estimator, algorithm, _ = job
-            results.append({
-                "platform": platform,
-                "tasks": tasks,
-                "algorithm": algorithm,
-                "makespan": makespan,
-                "exec_time": exec_time,
-                "comm_time": comm_time,
-                "sched_time": sched_time,
-                "expected_makespan": exp_makespan
-            })
-
-    with open(args.output, "w") as out_file:
-        json.dump(results, out_file, indent=4)
+    # maxtasksperchild=1 is required as well, workers can't be reused:
+    #    SimGrid can't be reinitialized after csimdag.exit(), so a process can host only one Simulation
+    # for the same reason imap_unordered chunksize must stay 1:
+    #    the pool counts a whole chunk as one task, so a larger chunk would run several simulations in one worker
+    #
+    # charts are rendered by a separate pool from the data collected by simulation workers,
+    # so a simulation worker is released as soon as its run is done.
+    # both pools share the -j budget, with at least one worker each
+    chart_jobs = max(1, args.jobs // 2) if args.make_charts else 0
+    simulation_jobs = max(1, args.jobs - chart_jobs)
+    chart_pool = ctx.Pool(processes=chart_jobs) if args.make_charts else None
+
+    def report_chart_error(error):
+        logger.error("Chart rendering failed: %s", error)
+
+    try:
+        with open(args.output, "w") as out_file, \
+                NoDaemonPool(processes=simulation_jobs, initializer=_init_worker, initargs=(config["log_level"],),
+                             maxtasksperchild=1, context=ctx) as pool:
+            if args.format == "json":
+                # records are written as they arrive, one per line
+                out_file.write("[\n")
+            separator = ""
+            for job, makespan, exec_time, comm_time, sched_time, exp_makespan, chart_spec in progress_reporter(
+                    pool.imap_unordered(run_experiment, jobs, 1), job_count, logger):
+                platform, tasks, estimator, algorithm, _ = job
+                result = {
+                    "platform": platform,
+                    "tasks": tasks,
+                    "algorithm": algorithm,
+                    "makespan": makespan,
+                    "exec_time": exec_time,
+                    "comm_time": comm_time,
+                    "sched_time": sched_time,
+                    "expected_makespan": exp_makespan
+                }
+                if args.format == "jsonl":
+                    # one record per line, written as soon as it's ready so partial results survive a crash
+                    out_file.write(json.dumps(result) + "\n")
+                    out_file.flush()
+                else:
+                    out_file.write(separator + json.dumps(result))
+                    separator = ",\n"
+                if chart_spec is not None:
+                    chart_pool.apply_async(make_chart, (chart_spec,), error_callback=report_chart_error)
+
+            if args.format == "json":
+                out_file.write("\n]\n")
+    finally:
+        if chart_pool is not None:
+            chart_pool.close()
+            chart_pool.join()
 
 
 if __name__ == "__main__":
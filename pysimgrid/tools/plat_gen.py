@@ -31,7 +31,7 @@ Usage::
                                        num_hosts host_speed
                                        link_bandwidth link_latency
                                        [--loopback_bandwidth] [--loopback_latency]
-                                       [--include_master]
+                                       [--include_master] [-j JOBS] [--pack]
 
     positional arguments:
       output_dir        path to output directory
@@ -48,6 +48,10 @@ Usage::
 
     optional arguments:
       -h, --help            show this help message and exit
+      -j JOBS, --jobs JOBS  number of parallel jobs to run
+                            (default: number of CPUs)
+      --pack                write all systems into a single OUTPUT_DIR.tar archive
+                            instead of separate files
       --loopback_bandwidth  loopback link bandwidth in MBps
       --loopback_latency    loopback link latency in us
       --include_master      include special 'master' host into the cluster
@@ -56,12 +60,19 @@ Usage::
 from __future__ import print_function
 
 import argparse
+import concurrent.futures
+import contextlib
+import io
+import itertools
 import os
-import random
+import tarfile
+import time
+
+import numpy as np
 
 
 def generate_cluster(include_master, num_hosts, host_speed, host_bandwidth, host_latency,
-                     master_bandwidth, master_latency, loopback_bandwidth, loopback_latency):
+                     master_bandwidth, master_latency, loopback_bandwidth, loopback_latency, rng):
     hosts = []
     links = []
     routes = []
@@ -81,10 +92,12 @@ def generate_cluster(include_master, num_hosts, host_speed, host_bandwidth, host
             "id": "master",
             "speed": 1
         })
+        bandwidth, = generate_values(master_bandwidth, 1, rng)
+        latency, = generate_values(master_latency, 1, rng)
         master_link = {
             "id": "link_master",
-            "bandwidth": generate_values(master_bandwidth, 1)[0],
-            "latency": generate_values(master_latency, 1)[0],
+            "bandwidth": bandwidth,
+            "latency": latency,
         }
         links.append(master_link)
         routes.append({
@@ -104,19 +117,19 @@ def generate_cluster(include_master, num_hosts, host_speed, host_bandwidth, host
         })
 
     # worker hosts
-    host_speeds = generate_values(host_speed, num_hosts)
-    link_bandwidths = generate_values(host_bandwidth, num_hosts)
-    link_latencies = generate_values(host_latency, num_hosts)
-    for i in range(0, num_hosts):
+    host_speeds = generate_values(host_speed, num_hosts, rng)
+    link_bandwidths = generate_values(host_bandwidth, num_hosts, rng)
+    link_latencies = generate_values(host_latency, num_hosts, rng)
+    for i, speed, bandwidth, latency in zip(range(0, num_hosts), host_speeds, link_bandwidths, link_latencies):
         host = {
             "id": "host%d" % i,
-            "speed": host_speeds[i]
+            "speed": speed
         }
         hosts.append(host)
         link = {
             "id": "link%d" % i,
-            "bandwidth": link_bandwidths[i],
-            "latency": link_latencies[i]
+            "bandwidth": bandwidth,
+            "latency": latency
         }
         links.append(link)
         routes.append({
@@ -143,97 +156,136 @@ def generate_cluster(include_master, num_hosts, host_speed, host_bandwidth, host
     return system
 
 
-def generate_values(spec, num):
+def parse_spec(spec):
     try:
         # fixed value
-        fixed = float(spec)
-        values = [fixed] * num
-
+        return ("fixed", float(spec))
     except ValueError:
         # uniform distribution: min-max
         parts = spec.split("-")
-        min_value = float(parts[0])
-        max_value = float(parts[1])
-        values = [random.uniform(min_value, max_value) for _ in range(0, num)]
+        return ("uniform", float(parts[0]), float(parts[1]))
 
-    return values
 
+def generate_values(spec, num, rng):
+    # spec is a tuple returned by parse_spec
+    if spec[0] == "fixed":
+        return itertools.repeat(spec[1], num)
+    return rng.uniform(spec[1], spec[2], num).tolist()
 
-def save_as_xml_file(system, output_path):
-    with open(output_path, "w") as f:
-        f.write("<?xml version='1.0'?>\n")
-        f.write('<!DOCTYPE platform SYSTEM "http://simgrid.gforge.inria.fr/simgrid/simgrid.dtd">\n')
-        f.write('<platform version="4">\n')
-        f.write('  <AS id="AS0" routing="Floyd">\n')
 
-        for host in system["hosts"]:
-            f.write('  <host id="%s" core="1" speed="%fGf"/>\n' % (host["id"], host["speed"]))
-        f.write("\n")
+def format_xml(system):
+    parts = [
+        "<?xml version='1.0'?>\n",
+        '<!DOCTYPE platform SYSTEM "http://simgrid.gforge.inria.fr/simgrid/simgrid.dtd">\n',
+        '<platform version="4">\n',
+        '  <AS id="AS0" routing="Floyd">\n'
+    ]
 
-        for link in system["links"]:
-            f.write('  <link id="%s" bandwidth="%fMBps" latency="%fus" sharing_policy="%s"/>\n' % (
-                link["id"], link["bandwidth"], link["latency"], link.get("sharing_policy", "SHARED")))
-        f.write("\n")
+    parts.extend(f'  <host id="{host["id"]}" core="1" speed="{host["speed"]:f}Gf"/>\n' for host in system["hosts"])
+    parts.append("\n")
 
-        f.write('  <router id="router"/>\n')
-        for route in system["routes"]:
-            f.write('  <route src="%s" dst="%s" symmetrical="%s">\n' %
-                    (route["src"], route["dst"], route.get("symmetrical", "YES")))
-            for link in route["links"]:
-                f.write('    <link_ctn id="%s"/>\n' % link)
-            f.write('  </route>\n')
+    parts.extend(f'  <link id="{link["id"]}" bandwidth="{link["bandwidth"]:f}MBps" latency="{link["latency"]:f}us" '
+                 f'sharing_policy="{link.get("sharing_policy", "SHARED")}"/>\n' for link in system["links"])
+    parts.append("\n")
 
-        f.write("  </AS>\n")
-        f.write("</platform>\n")
+    parts.append('  <router id="router"/>\n')
+    for route in system["routes"]:
+        parts.append(f'  <route src="{route["src"]}" dst="{route["dst"]}" '
+                     f'symmetrical="{route.get("symmetrical", "YES")}">\n')
+        parts.extend(f'    <link_ctn id="{link}"/>\n' for link in route["links"])
+        parts.append('  </route>\n')
 
+    parts.append("  </AS>\n")
+    parts.append("</platform>\n")
+    return "".join(parts)
 
-def main(output_dir, num_systems, seed, system_type, num_hosts, host_speed, link_bandwidth, link_latency,
-         loopback_bandwidth, loopback_latency, include_master):
-    random.seed(seed)
 
+def save_as_xml_file(system, output_path):
+    with open(output_path, "w") as f:
+        f.write(format_xml(system))
+
+
+def _generate_system(job):
+    config, seed, output_path, pack = job
+    system = generate_cluster(*config, np.random.default_rng(seed))
+    if pack:
+        # packed systems are sent back to the parent, which owns the archive
+        return output_path, format_xml(system).encode("utf-8")
+    save_as_xml_file(system, output_path)
+    return output_path, None
+
+
+def main(output_dir, num_systems, seed, system_type, num_hosts, host_speed, link_bandwidth, link_latency,
+         loopback_bandwidth, loopback_latency, include_master, jobs=None, pack=False):
     if system_type != 'cluster':
         print('Unsupported system type')
         return 1
 
-    if not os.path.exists(output_dir):
+    if not pack and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    # parse host/master bandwidth and latency
+    if ":" in link_bandwidth:
+        parts = link_bandwidth.split(":")
+        host_bandwidth = parts[0]
+        master_bandwidth = parts[1]
+    else:
+        host_bandwidth = link_bandwidth
+        master_bandwidth = link_bandwidth
+    if ":" in link_latency:
+        parts = link_latency.split(":")
+        host_latency = parts[0]
+        master_latency = parts[1]
+    else:
+        host_latency = link_latency
+        master_latency = link_latency
+
+    config = (include_master, num_hosts, parse_spec(host_speed),
+              parse_spec(host_bandwidth), parse_spec(host_latency),
+              parse_spec(master_bandwidth), parse_spec(master_latency),
+              loopback_bandwidth, loopback_latency)
+    system_jobs = []
     for i in range(0, num_systems):
-        # parse host/master bandwidth and latency
-        if ":" in link_bandwidth:
-            parts = link_bandwidth.split(":")
-            host_bandwidth = parts[0]
-            master_bandwidth = parts[1]
-        else:
-            host_bandwidth = link_bandwidth
-            master_bandwidth = link_bandwidth
-        if ":" in link_latency:
-            parts = link_latency.split(":")
-            host_latency = parts[0]
-            master_latency = parts[1]
-        else:
-            host_latency = link_latency
-            master_latency = link_latency
-
-        # generate cluster
-        system = generate_cluster(include_master, num_hosts, host_speed,
-                                  host_bandwidth, host_latency, master_bandwidth, master_latency,
-                                  loopback_bandwidth, loopback_latency)
         file_name = "cluster_%d_%s_%s_%s_%d.xml" % (
             num_hosts, host_speed, link_bandwidth, link_latency, i)
-
-        file_path = output_dir + "/" + file_name
-        save_as_xml_file(system, file_path)
-        print("Generated file: %s" % file_path)
+        system_jobs.append((config, [seed, i], os.path.join(output_dir, file_name), pack))
+
+    with contextlib.ExitStack() as stack:
+        if pack:
+            # members keep the output directory name as their path prefix
+            archive_path = os.path.normpath(output_dir) + ".tar"
+            archive = stack.enter_context(tarfile.open(archive_path, "w"))
+            prefix = os.path.basename(os.path.normpath(output_dir))
+            mtime = time.time()
+        executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=jobs))
+        for file_path, data in executor.map(_generate_system, system_jobs, chunksize=4):
+            if pack:
+                info = tarfile.TarInfo(prefix + "/" + os.path.basename(file_path))
+                info.size = len(data)
+                info.mtime = mtime
+                archive.addfile(info, io.BytesIO(data))
+                file_path = archive_path + ":" + info.name
+            print("Generated file: %s" % file_path)
 
     return 0
 
 
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("expected a positive integer, got %s" % value)
+    return number
+
+
 def _cli():
     parser = argparse.ArgumentParser(description="Generator of synthetic systems")
     parser.add_argument("output_dir", type=str, help="path to output directory")
     parser.add_argument("num_systems", type=int, help="number of generated systems")
     parser.add_argument("seed", type=int, help="random seed")
+    parser.add_argument("-j", "--jobs", type=_positive_int, default=os.cpu_count() or 1,
+                        help="number of parallel jobs to run")
+    parser.add_argument("--pack", action="store_true", default=False,
+                        help="write all systems into a single OUTPUT_DIR.tar archive instead of separate files")
     subparsers = parser.add_subparsers(dest="system_type",
                                        help="system type (only 'cluster' is supported in current version)")
 
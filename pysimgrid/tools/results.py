@@ -17,20 +17,40 @@
 #
 
 import argparse
-import collections
 import functools
+import itertools
 import json
 import numpy
+import operator
 import os
+import sys
 import textwrap
 
 
+def load_results(path):
+    # experiment output contains NaN (failed runs, schedulers without expected makespan),
+    # which strict parsers such as orjson reject, so the stdlib json is used
+    with open(path) as f:
+        return index_names(json.load(f))
+
+
+def index_names(results):
+    for item in results:
+        app = str(os.path.basename(item["tasks"]).rsplit(".", 1)[0])
+        system = str(os.path.basename(item["platform"]).rsplit(".", 1)[0])
+        item["_app"] = app
+        item["_sys"] = system
+        item["_app_parts"] = app.split("_")
+        item["_sys_parts"] = system.split("_")
+    return results
+
+
 def get_app_name(item):
-    return str(os.path.basename(item["tasks"]).rsplit(".", 1)[0])
+    return item["_app"]
 
 
 def get_system_name(item):
-    return str(os.path.basename(item["platform"]).rsplit(".", 1)[0])
+    return item["_sys"]
 
 
 def get_algorithm(item):
@@ -42,37 +62,37 @@ def filter_results(results, filter):
     entity = selector[0]
     pos = int(selector[1:]) - 1
     if entity == 'A':
-        return [item for item in results if get_app_name(item).split("_")[pos] == value]
+        return [item for item in results if item["_app_parts"][pos] == value]
     elif entity == 'S':
-        return [item for item in results if get_system_name(item).split("_")[pos] == value]
+        return [item for item in results if item["_sys_parts"][pos] == value]
     else:
         raise Exception("Unsupported selector")
 
 
 def compute_metric(results, metric, baseline_algo=None):
-    for app, byapp in groupby(results, get_app_name):
-        for system, bysys in groupby(byapp, get_system_name):
-            algorithm_results = groupby(bysys, get_algorithm, False)
-            for algorithm, byalg in algorithm_results.items():
-                if metric == "makespan":
-                    byalg[0]["result"] = byalg[0]["makespan"]
-                if metric == "norm_makespan":
-                    assert len(algorithm_results[baseline_algo]) == 1
-                    baseline = algorithm_results[baseline_algo][0]
-                    byalg[0]["result"] = byalg[0]["makespan"] / baseline["makespan"]
-                elif metric == "norm_exp_makespan":
-                    byalg[0]["result"] = byalg[0]["makespan"] / byalg[0]["expected_makespan"]
+    # records are sorted once, so every (application, system) cell is a contiguous run
+    cell_key = operator.itemgetter("_app", "_sys")
+    ordered = sorted(results, key=lambda item: (item["_app"], item["_sys"], get_algorithm(item)))
+    for _, bycell in itertools.groupby(ordered, cell_key):
+        algorithm_results = {algorithm: list(byalg) for algorithm, byalg in itertools.groupby(bycell, get_algorithm)}
+        for algorithm, byalg in algorithm_results.items():
+            if metric == "makespan":
+                byalg[0]["result"] = byalg[0]["makespan"]
+            if metric == "norm_makespan":
+                assert len(algorithm_results[baseline_algo]) == 1
+                baseline = algorithm_results[baseline_algo][0]
+                byalg[0]["result"] = byalg[0]["makespan"] / baseline["makespan"]
+            elif metric == "norm_exp_makespan":
+                byalg[0]["result"] = byalg[0]["makespan"] / byalg[0]["expected_makespan"]
 
 
 def get_group(selector, item):
-    app = get_app_name(item)
-    system = get_system_name(item)
     entity = selector[0]
     pos = int(selector[1:]) - 1
     if entity == 'A':
-        return app.split("_")[pos]
+        return item["_app_parts"][pos]
     elif entity == 'S':
-        return system.split("_")[pos]
+        return item["_sys_parts"][pos]
     else:
         raise Exception("Unsupported selector")
 
@@ -86,49 +106,46 @@ def create_group(group_spec):
     return group
 
 
-def groupby(results, func, asitems=True):
-    groups = collections.defaultdict(list)
-    for data in results:
-        key = func(data)
-        groups[key].append(data)
-    return groups.items() if asitems else groups
-
-
 def group_results(results, algorithms, group1_func, group2_func):
+    # a single sort puts every (group1, group2, algorithm) cell into a contiguous run,
+    # with algorithms in the requested order
+    alg_rank = {algorithm: rank for rank, algorithm in enumerate(algorithms)}
+    ordered = sorted(results, key=lambda item: (group1_func(item), group2_func(item),
+                                                alg_rank[get_algorithm(item)]))
     grouped_results = []
-    for c1, bygroup1 in sorted(groupby(results, group1_func)):
+    for c1, bygroup1 in itertools.groupby(ordered, group1_func):
         res1 = {'group': c1, 'results': []}
-        for c2, bygroup2 in sorted(groupby(bygroup1, group2_func)):
+        for c2, bygroup2 in itertools.groupby(bygroup1, group2_func):
             res2 = {'group': c2, 'results': []}
-            for algorithm, byalg in sorted(groupby(bygroup2, get_algorithm), key=lambda pair: algorithms.index(pair[0])):
-                mean = numpy.mean([r["result"] for r in byalg])
-                std = numpy.std([r["result"] for r in byalg])
-                res2['results'].append({'mean': mean, 'std': std})
+            for algorithm, byalg in itertools.groupby(bygroup2, get_algorithm):
+                byalg = list(byalg)
+                values = numpy.fromiter((r["result"] for r in byalg), dtype=numpy.float64, count=len(byalg))
+                res2['results'].append({'mean': values.mean(), 'std': values.std()})
             res1['results'].append(res2)
         grouped_results.append(res1)
     return grouped_results
 
 
 def output_plain(results, algorithms, label1, label2, std):
-    print("")
-    print(("  %s" % label2).ljust(20), end="")
+    out = ["\n", f"  {label2}".ljust(20)]
     for alg in algorithms:
         if std is True:
-            print(alg.ljust(15), end="")
+            out.append(alg.ljust(15))
         else:
-            print(alg[:6].ljust(8), end="")
-    print("")
+            out.append(alg[:6].ljust(8))
+    out.append("\n")
     for group1_res in results:
-        print("\n%s: %s\n" % (label1, str(group1_res['group'])))
+        out.append(f"\n{label1}: {group1_res['group']}\n\n")
         for group2_res in group1_res['results']:
-            print(("  %s" % (str(group2_res['group']))).ljust(20), end="")
-            for res in group2_res['results']:
-                if std is True:
-                    print(("%5.3f (%5.3f)" % (res['mean'], res['std'])).ljust(15), end="")
-                else:
-                    print(("%5.3f" % res['mean']).ljust(8), end="")
-            print("")
-    print("")
+            out.append(f"  {group2_res['group']}".ljust(20))
+            cells = group2_res['results']
+            if std is True:
+                out.extend(f"{res['mean']:5.3f} ({res['std']:5.3f})".ljust(15) for res in cells)
+            else:
+                out.extend(f"{res['mean']:5.3f}".ljust(8) for res in cells)
+            out.append("\n")
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def par(string):
@@ -136,34 +153,38 @@ def par(string):
 
 
 def output_latex(results, algorithms, label1, label2, std):
-    print(par(r"""
+    out = [par(r"""
   \begin{table}
   \caption{TODO}
   \begin{center}
      \small\begin{tabular}{*{%d}{l}}
   \toprule
   %s & %s \\ \midrule
-  """) % (len(algorithms) + 1, label2, " &  ".join(algorithms),))
-    for group1_res in results:
-        print(par(r"""
+  """) % (len(algorithms) + 1, label2, " &  ".join(algorithms),), "\n"]
+    group1_header = par(r"""
     \multicolumn{%d}{l}{%s=%s} \\ \midrule
-    """) % (len(algorithms) + 1, label1, str(group1_res['group'])))
+    """) + "\n"
+    columns = len(algorithms) + 1
+    for group1_res in results:
+        out.append(group1_header % (columns, label1, str(group1_res['group'])))
         for group2_res in group1_res['results']:
-            print("%-15s" % str(group2_res['group']), end="")
-            for res in group2_res['results']:
-                if std is True:
-                    print(" & %5.3f (%5.3f)" % (res['mean'], res['std']), end="")
-                else:
-                    print(" & %5.3f" % res['mean'], end="")
-            print(r" \\")
-        print(r"\midrule")
-    print(par(r"""
+            out.append(f"{str(group2_res['group']):<15}")
+            cells = group2_res['results']
+            if std is True:
+                out.extend(f" & {res['mean']:5.3f} ({res['std']:5.3f})" for res in cells)
+            else:
+                out.extend(f" & {res['mean']:5.3f}" for res in cells)
+            out.append(" \\\\\n")
+        out.append("\\midrule\n")
+    out.append(par(r"""
   \bottomrule
   \end{tabular}
   \end{center}
   \label{tab:TODO}
   \end{table}
   """))
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def main():
@@ -188,8 +209,7 @@ def main():
 
     args = parser.parse_args()
 
-    with open(args.results) as f:
-        results = json.load(f)
+    results = load_results(args.results)
 
     if args.filter is not None:
         results = filter_results(results, args.filter)
@@ -1,17 +1,23 @@
 import argparse
+import re
+
+# DOT files are scanned as bytes: sizes are ASCII and no decoding is needed
+_SIZE_REGEX = re.compile(rb'size="([^"]+)"')
+_IO_BUFFER = 1 << 20
 
 
 def calculate_ccr(file):
     total_comm = 0.
     total_comp = 0.
-    with open(file, "r") as input:
+    with open(file, "rb") as input:
         for line in input:
-            if '->' in line:
-                size = float(line.split('size="')[1].split('"')[0])
-                total_comm += size
-            elif 'size="' in line:
-                size = float(line.split('size="')[1].split('"')[0])
-                total_comp += size
+            match = _SIZE_REGEX.search(line)
+            if match is None:
+                continue
+            if b'->' in line:
+                total_comm += float(match.group(1))
+            else:
+                total_comp += float(match.group(1))
 
     return total_comm / total_comp
 
@@ -37,19 +43,23 @@ def main():
 
     if args.output_file is not None:
         factor = args.ccr / input_ccr
-        with open(args.output_file, "w") as out:
-            with open(args.input_file, "r") as input:
+        # output CCR is summed from the written (rounded) sizes
+        total_comm = 0.
+        total_comp = 0.
+        with open(args.output_file, "wb", buffering=_IO_BUFFER) as out:
+            with open(args.input_file, "rb", buffering=_IO_BUFFER) as input:
                 for line in input:
-                    if '->' in line:
-                        parts = line.split('size="')
-                        size = float(parts[1].split('"')[0])
-                        new_size = size * factor
-                        new_line = '%ssize="%e"%s' % (parts[0], new_size, parts[1].split('"')[1])
-                        out.write(new_line)
-                    else:
-                        out.write(line)
-
-        output_ccr = calculate_ccr(args.output_file)
+                    match = _SIZE_REGEX.search(line)
+                    if match is not None:
+                        if b'->' in line:
+                            new_size = b'%e' % (float(match.group(1)) * factor)
+                            total_comm += float(new_size)
+                            line = b'%ssize="%s"%s' % (line[:match.start()], new_size, line[match.end():])
+                        else:
+                            total_comp += float(match.group(1))
+                    out.write(line)
+
+        output_ccr = total_comm / total_comp
         print("Output CCR: %f" % output_ccr)
         if system_factor is not None:
             print("Output system CCR: %f" % (output_ccr * system_factor))
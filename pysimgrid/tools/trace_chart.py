@@ -18,50 +18,65 @@
 
 
 import argparse
+import array
 import sys
 import matplotlib.pyplot as plt
+import numpy as np
 
 
-def show_plot(raw_trace):
-  trace = raw_trace.strip().split('\n')
+_TRACE_READ_BUFFER = 1 << 20
 
+
+def show_plot(trace_path):
   types  = {}
   hosts = {}
   links = {}
-  schedule = {}
+  # start/stop times per host are kept in flat float arrays and paired in bulk after parsing
+  starts = {}
+  stops = {}
   end = 0
 
-  for line in trace:
-    if line.startswith('0 '):
-      _, alias, type_, name = line.strip().split(' ')
-      types[alias] = name
-    elif line.startswith('6 '):
-      _, _, alias, type_, container, name = line.strip().split(' ')
-      if types[type_] == 'HOST':
-          hosts[alias] = name
-    elif line.startswith('8 '):
-      # PageSetVariable
-      # Init the work on the schedule
-      _, time, type_, container, value = line.strip().split(' ')
-      if container in hosts:
-        schedule[hosts[container]] = []
-    elif line.startswith('9 '):
-      # PajeAddVariable
-      # Start to calculate a task
-      _, time, type_, container, value = line.strip().split(' ')
-      if container in hosts:
-        schedule[hosts[container]].append([float(time), None])
-    elif line.startswith('10 '):
-      # PajeSubVariable
-      # Finish to calculate a task
-      _, time, type_, container, value = line.strip().split(' ')
-      if container in hosts:
-        schedule[hosts[container]][-1][1] = float(time) - schedule[hosts[container]][-1][0]
-        end = max(end, float(time))
+  with open(trace_path, "r", buffering=_TRACE_READ_BUFFER) as trace:
+    for line in trace:
+      fields = line.split()
+      if not fields:
+        continue
+      code = fields[0]
+      if code == '9':
+        # PajeAddVariable
+        # Start to calculate a task
+        _, time, type_, container, value = fields
+        if container in hosts:
+          starts[hosts[container]].append(float(time))
+      elif code == '10':
+        # PajeSubVariable
+        # Finish to calculate a task
+        _, time, type_, container, value = fields
+        if container in hosts:
+          stops[hosts[container]].append(float(time))
+      elif code == '0':
+        _, alias, type_, name = fields
+        types[alias] = name
+      elif code == '6':
+        _, _, alias, type_, container, name = fields
+        if types[type_] == 'HOST':
+            hosts[alias] = name
+      elif code == '8':
+        # PageSetVariable
+        # Init the work on the schedule
+        _, time, type_, container, value = fields
+        if container in hosts:
+          starts[hosts[container]] = array.array('d')
+          stops[hosts[container]] = array.array('d')
 
   fig, ax = plt.subplots()
-  for i, host in enumerate(sorted(schedule)):
-      ax.broken_barh(schedule[host], (i*2, 1), facecolors="grey")
+  for i, host in enumerate(sorted(starts)):
+      # each stop closes the start preceding it, an unfinished last task is dropped
+      host_stops = np.asarray(stops[host], dtype=float)
+      host_starts = np.asarray(starts[host], dtype=float)[:len(host_stops)]
+      if len(host_stops):
+        end = max(end, host_stops.max())
+      ax.broken_barh(np.column_stack((host_starts, host_stops - host_starts)), (i*2, 1), facecolors="grey")
   ax.set_ylim(0, len(hosts) * 2 + 1)
   ax.set_xlim(0, end)
   ax.set_yticks(range(len(hosts) * 2))
@@ -72,6 +87,4 @@ if __name__ == "__main__":
   parser = argparse.ArgumentParser(description="Host utilization visualization from SimGrid Paje trace files")
   parser.add_argument("trace_file", type=str, help="path to trace file to visualize")
   args = parser.parse_args()
-  with open(args.trace_file, "r") as f:
-    raw_trace = f.read()
-    show_plot(raw_trace)
+  show_plot(args.trace_file)
@@ -6,6 +6,10 @@ Typical 'pythonic' approaches doesn't work well:
 * nosetests still tries to execute multiple test cases in a single process
 * multiprocessing is unable to intercept/redirect native stdout from C library
 
+So each test gets its own fresh interpreter.
+--forkserver instead forks each test process from a server with numpy/networkx preloaded,
+output is then silenced by redirecting the process file descriptors.
+
 Zero flexibility, runs everything on a working copy for now.
 Can be vastly improved if necessary.
 """
@@ -15,71 +19,155 @@ from __future__ import print_function
 import os
 import sys
 import re
+import inspect
+import queue
+import select
 import unittest
 import subprocess
 import time
 import argparse
+import threading
+import multiprocessing
+import concurrent.futures
 
 DEFAULT_TIMEOUT = 10
-POLL_INTERVAL = 0.01
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 TESTS_PACKAGE = "test"
 TESTS_ROOT = os.path.join(PROJECT_ROOT, TESTS_PACKAGE)
-TEST_MODULE_REGEX = re.compile("^test.*\.py$")
+PRINT_LOCK = threading.Lock()
+# imported once by the fork server.
+# pysimgrid itself must not be there: SimGrid library init doesn't survive a fork (see tools/experiment.py)
+PRELOAD_MODULES = ["numpy", "networkx"]
 
 if PROJECT_ROOT not in sys.path:
   sys.path.insert(0, PROJECT_ROOT)
 
+def iterate_tests(suite):
+  for test in suite:
+    if isinstance(test, unittest.TestSuite):
+      yield from iterate_tests(test)
+    else:
+      yield test
+
 def collect_tests():
+  loader = unittest.TestLoader()
+  suite = loader.discover(TESTS_ROOT, pattern="test*.py", top_level_dir=PROJECT_ROOT)
+  if loader.errors:
+    # discovery doesn't raise on broken test modules, it only records them
+    raise ImportError("\n".join(loader.errors))
   tests = []
-  for root, _, files in os.walk(TESTS_ROOT):
-    for f in files:
-      if TEST_MODULE_REGEX.match(f):
-        test_file = os.path.join(root, f)
-        module_name, _ = os.path.splitext(os.path.relpath(test_file, PROJECT_ROOT))
-        module_name = module_name.replace("/", ".")
-        module = __import__(module_name)
-        for namepart in module_name.split(".")[1:]:
-          module = getattr(module, namepart)
-        for test_class in unittest.findTestCases(module)._tests:
-          for test_function in test_class._tests:
-            test_full_name = ".".join([module_name, type(test_function).__name__, test_function._testMethodName])
-            tests.append((test_file, module_name, test_full_name))
+  for test in iterate_tests(suite):
+    test_class = type(test)
+    tests.append((inspect.getfile(test_class), test_class.__module__, test.id()))
   return tests
 
-def run_tests(test_list, show_output):
-  any_failed = False
-  reports = []
-  for filename, module, test in test_list:
+def wait_process(process, timeout):
+  """
+  Wait for the process to exit, returns its exit code or None on timeout.
+  """
+  pidfd = None
+  if hasattr(os, "pidfd_open"):
+    try:
+      pidfd = os.pidfd_open(process.pid)
+    except OSError:
+      # kernel without pidfd support (pre-5.3)
+      pidfd = None
+  if pidfd is not None:
+    # pidfd becomes readable when the process exits, so the wait is fully blocking
+    try:
+      ready, _, _ = select.select([pidfd], [], [], timeout)
+    finally:
+      os.close(pidfd)
+    return process.wait() if ready else None
+  try:
+    return process.wait(timeout=timeout)
+  except subprocess.TimeoutExpired:
+    return None
+
+def pin_process(pid, cpu):
+  if cpu is None:
+    return
+  try:
+    os.sched_setaffinity(pid, {cpu})
+  except OSError:
+    # the process may have already exited
+    pass
+
+def run_subprocess(test, show_output, cpu=None):
+  output = None if show_output else subprocess.DEVNULL
+  process = subprocess.Popen([sys.executable, "-B", "-m", "unittest", test], cwd=PROJECT_ROOT, stdout=output, stderr=output)
+  pin_process(process.pid, cpu)
+  retcode = wait_process(process, DEFAULT_TIMEOUT)
+  if retcode is None:
+    process.kill()
+    process.wait()
+  return retcode
+
+def forked_test_main(test, show_output):
+  # equivalent of 'python -B -m unittest <test>' in a process forked from the preloaded server
+  sys.dont_write_bytecode = True
+  os.chdir(PROJECT_ROOT)
+  if not show_output:
+    # redirect on descriptor level, so output of the native library is silenced as well
+    null_fd = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(null_fd, 1)
+    os.dup2(null_fd, 2)
+  unittest.main(module=None, argv=["unittest", test])
+
+def run_forked(context, test, show_output, cpu=None):
+  # still one process per test: crashes and timeouts stay isolated
+  process = context.Process(target=forked_test_main, args=(test, show_output))
+  process.start()
+  pin_process(process.pid, cpu)
+  process.join(DEFAULT_TIMEOUT)
+  if process.exitcode is None:
+    process.terminate()
+    process.join()
+    return None
+  return process.exitcode
+
+def run_test(test, show_output, context=None, cpu_slots=None):
+  with PRINT_LOCK:
     print("* ", "Starting", test, "...")
-    # Python 2.7 compatibility kludges:
-    #  * use open(os.devnull,...) instead of subprocess.DEVNULL
-    #  * use POpen.poll
-    with open(os.devnull, "w") as null_output:
-      if show_output:
-        output_config = {channel: None for channel in ["stdout", "stderr"]}
-      else:
-        output_config = {channel: null_output for channel in ["stdout", "stderr"]}
-      start_time = time.time()
-      process = subprocess.Popen([sys.executable, "-B", "-m", "unittest", test], cwd=PROJECT_ROOT, **output_config)
-      while (time.time() - start_time) < DEFAULT_TIMEOUT:
-        retcode = process.poll()
-        if retcode is not None:
-          break
-      retcode = process.poll()
-      test_failed = False
-      execution_time_str = "{:.2f}s".format(time.time() - start_time)
-      if retcode is None:
-        process.kill()
-        test_failed = True
-        execution_time_str = "TIMEOUT ({} seconds)".format(DEFAULT_TIMEOUT)
-      else:
-        test_failed = retcode != 0
-    report = " ".join(["  ", "FAILED" if test_failed else "PASSED", execution_time_str, test])
-    reports.append(report)
-    if not show_output:
+  cpu = cpu_slots.get() if cpu_slots is not None else None
+  start_time = time.time()
+  try:
+    if context is None:
+      retcode = run_subprocess(test, show_output, cpu)
+    else:
+      retcode = run_forked(context, test, show_output, cpu)
+  finally:
+    if cpu_slots is not None:
+      cpu_slots.put(cpu)
+  test_failed = False
+  execution_time_str = "{:.2f}s".format(time.time() - start_time)
+  if retcode is None:
+    test_failed = True
+    execution_time_str = "TIMEOUT ({} seconds)".format(DEFAULT_TIMEOUT)
+  else:
+    test_failed = retcode != 0
+  report = " ".join(["  ", "FAILED" if test_failed else "PASSED", execution_time_str, test])
+  if not show_output:
+    with PRINT_LOCK:
       print(report)
-    any_failed = any_failed or test_failed
+  return report, test_failed
+
+def run_tests(test_list, show_output, jobs=1, context=None):
+  any_failed = False
+  reports = []
+  cpu_slots = None
+  if jobs > 1 and hasattr(os, "sched_setaffinity"):
+    # concurrent tests are pinned to distinct cores, so they don't migrate and evict each other's caches
+    cpus = sorted(os.sched_getaffinity(0))
+    cpu_slots = queue.Queue()
+    for slot in range(jobs):
+      cpu_slots.put(cpus[slot % len(cpus)])
+  # each test already runs in its own process, threads only wait for them
+  with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+    results = executor.map(lambda test_data: run_test(test_data[2], show_output, context, cpu_slots), test_list)
+    for report, test_failed in results:
+      reports.append(report)
+      any_failed = any_failed or test_failed
   if show_output:
     print()
     print("=" * 30)
@@ -92,27 +180,37 @@ def run_tests(test_list, show_output):
     print("All tests passed!")
   return int(any_failed)
 
+def positive_int(value):
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError("expected a positive integer, got %s" % value)
+  return number
+
 def main():
   parser = argparse.ArgumentParser()
   parser.add_argument("-N", "--collect-only", action="store_true", default=False, help="don't run tests, only collect the list")
   parser.add_argument("-V", "--verbose", action="store_true", default=False, help="show verbose output")
+  parser.add_argument("--forkserver", action="store_true", default=False, help="fork each test from a server with preloaded modules instead of starting a fresh interpreter")
+  parser.add_argument("-j", "--jobs", type=positive_int, default=os.cpu_count() or 1, help="number of tests to run in parallel (ignored with -V)")
   parser.add_argument("tests_to_run", nargs="*", help="optional: run tests by (any of passed) regex")
   args = parser.parse_args()
   test_list = collect_tests()
   if args.tests_to_run:
-    filtered = []
-    regexes = [re.compile(expr) for expr in args.tests_to_run]
-    for test_data in test_list:
-      _, _, test = test_data
-      if any([r.search(test) for r in regexes]):
-        filtered.append(test_data)
-    test_list = filtered
+    # a single alternation matches if any of the expressions does
+    regex = re.compile("|".join("(?:%s)" % expr for expr in args.tests_to_run))
+    test_list = [test_data for test_data in test_list if regex.search(test_data[2])]
   if args.collect_only:
     print("Tests found:")
     for filename, module, test in test_list:
       print("  ", test)
     return 0
-  return run_tests(test_list, args.verbose)
+  # verbose output of concurrent tests would be interleaved
+  jobs = 1 if args.verbose else args.jobs
+  context = None
+  if args.forkserver and "forkserver" in multiprocessing.get_all_start_methods():
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(PRELOAD_MODULES)
+  return run_tests(test_list, args.verbose, jobs, context)
 
 if __name__ == '__main__':
   sys.exit(main())
@@ -4,6 +4,7 @@ import os
 import sys
 import platform
 import textwrap
+import multiprocessing
 from setuptools import setup, Extension
 
 import numpy
@@ -46,21 +47,30 @@ if platform.system().lower() == "linux":
   EXT_OPTIONS["runtime_library_dirs"] = [os.path.join(SIMGRID_ROOT, "lib")]
 elif platform.system().lower() == "darwin":
   EXT_OPTIONS["extra_link_args"] = ["-Wl,-rpath," + os.path.join(SIMGRID_ROOT, "lib")]
+if platform.system().lower() in ("linux", "darwin"):
+  EXT_OPTIONS["extra_compile_args"] = ["-O3"]
+  # opt-in, as the resulting binaries are not portable to other CPUs
+  if os.environ.get("PYSIMGRID_NATIVE_ARCH"):
+    EXT_OPTIONS["extra_compile_args"].append("-march=native")
+
+# sources rely on Python 2 style implicit relative imports (e.g. 'import cplatform'),
+# so the language level is pinned instead of following the Cython default.
+# bounds/wraparound checks are disabled locally on hot loops only (see cscheduling.PlatformModel)
+CYTHON_DIRECTIVES = {
+  "embedsignature": True,
+  "language_level": 2,
+}
 
-sdwrapper = Extension("pysimgrid.csimdag",
-                      sources=[source_file("csimdag")],
-                      **EXT_OPTIONS)
-
-plwrapper = Extension("pysimgrid.cplatform",
-                      sources=[source_file("cplatform")],
-                      **EXT_OPTIONS)
-
-scwrapper = Extension("pysimgrid.cscheduling",
-                      sources=[source_file("cscheduling")],
-                      **EXT_OPTIONS)
+EXT_MODULES = ["csimdag", "cplatform", "cscheduling"]
 
-extensions = [sdwrapper, plwrapper, scwrapper]
-extensions = cythonize(extensions, compiler_directives={'embedsignature': True})
+extensions = [Extension("pysimgrid." + module, sources=[source_file(module)], **EXT_OPTIONS) for module in EXT_MODULES]
+# .pyx -> .c translation is independent per module.
+# worker processes are only safe with fork: spawned ones re-run this script from the top.
+CYTHON_NTHREADS = (os.cpu_count() or 1) if multiprocessing.get_start_method() == "fork" else 0
+# generated sources are also cached by content hash, so a branch switch or a fresh
+# checkout (which only touches timestamps) doesn't retranslate unchanged modules
+extensions = cythonize(extensions, nthreads=CYTHON_NTHREADS, compiler_directives=CYTHON_DIRECTIVES,
+                       cache=local_path("build", "cython-cache"))
 
 setup(name="pysimgrid",
       version="1.0.0",
@@ -9,8 +9,6 @@ import os
 import unittest
 import random
 import pysimgrid
-# PY 2/3 compatibility tools
-from pysimgrid.six import print_
 
 DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 def _data_path(*relpath):
@@ -54,6 +52,15 @@ class TestSimDAG(unittest.TestCase):
         else:
           self.assertEqual(pysimgrid.cplatform.route_bandwidth(h1, h2), 4.98e8)
         self.assertGreater(pysimgrid.cplatform.route_latency(h1, h2), 0)
+    bandwidth, latency = pysimgrid.cplatform.route_matrices(hosts)
+    for i, h1 in enumerate(hosts):
+      for j, h2 in enumerate(hosts):
+        if i != j:
+          self.assertEqual(bandwidth[i, j], pysimgrid.cplatform.route_bandwidth(h1, h2))
+          self.assertEqual(latency[i, j], pysimgrid.cplatform.route_latency(h1, h2))
+        else:
+          self.assertEqual(bandwidth[i, j], 0)
+          self.assertEqual(latency[i, j], 0)
     for h in hosts:
       h.dump()
 
@@ -63,16 +70,16 @@ class TestSimDAG(unittest.TestCase):
     """
     hosts = pysimgrid.csimdag.load_platform(_data_path("pl_4hosts.xml"))
     tasks = pysimgrid.csimdag.load_tasks(_data_path("basic_graph.dot"))
-    print_("Static random scheduling...")
+    print("Static random scheduling...")
     for t in tasks:
       if t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ:
         t.schedule(random.choice(hosts))
         print("  Scheduled {} on host {}".format(t.name, t.hosts[0].name))
-    print_("Starting the simulation...")
+    print("Starting the simulation...")
     pysimgrid.csimdag.simulate()
     for t in tasks:
       self.assertEqual(t.state, pysimgrid.csimdag.TASK_STATE_DONE)
-    print_("Simulation time:", pysimgrid.csimdag.get_clock())
+    print("Simulation time:", pysimgrid.csimdag.get_clock())
 
   def test_primitive_schedule(self):
     """
@@ -81,39 +88,43 @@ class TestSimDAG(unittest.TestCase):
     hosts = pysimgrid.csimdag.load_platform(_data_path("pl_4hosts.xml"))
     tasks = pysimgrid.csimdag.load_tasks(_data_path("basic_graph.dot"))
 
+    comp_tasks = [t for t in tasks if t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ]
     free_hosts = list(hosts)
     def schedule_all_schedulable():
-      for t in filter(lambda t: t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ and t.state == pysimgrid.csimdag.TASK_STATE_SCHEDULABLE, tasks):
+      for t in comp_tasks:
+        if t.state != pysimgrid.csimdag.TASK_STATE_SCHEDULABLE:
+          continue
         if free_hosts:
           t.schedule(free_hosts.pop())
-          print_("  Scheduled {} on host {}".format(t.name, t.hosts[0].name))
+          print("  Scheduled {} on host {}".format(t.name, t.hosts[0].name))
         else:
           break
 
-    print_("Setting up watchpoints...")
-    for t in filter(lambda t: t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ, tasks):
+    print("Setting up watchpoints...")
+    for t in comp_tasks:
       t.watch(pysimgrid.csimdag.TASK_STATE_DONE)
 
-    print_("First scheduling iteration:")
+    print("First scheduling iteration:")
     schedule_all_schedulable()
-    print_("Starting the simulation...")
+    print("Starting the simulation...")
     changed = pysimgrid.csimdag.simulate()
     while changed:
-      print_("Watchpoint reached, changed tasks:", [t.name for t in changed])
-      print_("  Schedulable:", [t.name for t in tasks if t.state == pysimgrid.csimdag.TASK_STATE_SCHEDULABLE])
-      print_("  Free hosts:", [h.name for h in hosts])
+      print("Watchpoint reached, changed tasks:", [t.name for t in changed])
+      print("  Schedulable:", [t.name for t in tasks if t.state == pysimgrid.csimdag.TASK_STATE_SCHEDULABLE])
+      print("  Free hosts:", [h.name for h in hosts])
       schedule_all_schedulable()
-      for t in filter(lambda t: t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ and t.state == pysimgrid.csimdag.TASK_STATE_DONE, changed):
-        free_hosts.append(t.hosts[0])
+      for t in changed:
+        if t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ and t.state == pysimgrid.csimdag.TASK_STATE_DONE:
+          free_hosts.append(t.hosts[0])
       changed = pysimgrid.csimdag.simulate()
 
-    print_("\nFinal state:")
-    for t in filter(lambda t: t.kind == pysimgrid.csimdag.TASK_KIND_COMP_SEQ, tasks):
-      print_(" ", t.name, t.hosts[0].name, t.start_time, t.finish_time)
+    print("\nFinal state:")
+    for t in comp_tasks:
+      print(" ", t.name, t.hosts[0].name, t.start_time, t.finish_time)
 
     for t in tasks:
       self.assertEqual(t.state, pysimgrid.csimdag.TASK_STATE_DONE)
-    print_("Simulation time:", pysimgrid.csimdag.get_clock())
+    print("Simulation time:", pysimgrid.csimdag.get_clock())
 
 
 if __name__ == '__main__':
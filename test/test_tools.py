@@ -0,0 +1,44 @@
+# This file is part of pysimgrid, a Python interface to the SimGrid library.
+#
+# Copyright 2015-2016 Alexey Nazarenko and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from pysimgrid.tools import results
+
+class TestResults(unittest.TestCase):
+  def test_load_nan_makespan(self):
+    """
+    Test loading experiment output with NaN values (failed run).
+    """
+    records = [
+      {"platform": "/x/cluster_5_1.xml", "tasks": "/x/daggen_50_0.dot", "algorithm": {"class": "x.HEFT", "name": "HEFT"},
+       "makespan": float("NaN"), "expected_makespan": float("NaN")},
+      {"platform": "/x/cluster_5_1.xml", "tasks": "/x/daggen_50_0.dot", "algorithm": {"class": "x.OLB", "name": "OLB"},
+       "makespan": 10., "expected_makespan": 12.},
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+      path = os.path.join(tmpdir, "results.json")
+      with open(path, "w") as f:
+        # experiment tool writes NaN as is
+        json.dump(records, f)
+      loaded = results.load_results(path)
+    self.assertEqual(len(loaded), 2)
+    self.assertTrue(math.isnan(loaded[0]["makespan"]))
+    self.assertEqual(loaded[0]["_app"], "daggen_50_0")
+    results.compute_metric(loaded, "makespan")
+    grouped = results.group_results(loaded, ["HEFT", "OLB"], results.get_app_name, results.get_system_name)
+    cells = grouped[0]["results"][0]["results"]
+    self.assertTrue(math.isnan(cells[0]["mean"]))
+    self.assertEqual(cells[1]["mean"], 10.)
+
+
+if __name__ == '__main__':
+  unittest.main()